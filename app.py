@@ -3,10 +3,12 @@
 import json
 import os
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from typing import Any, Dict, Iterable, List
 
 from flask import Flask, Response, jsonify, render_template, request
+from flask.json.provider import DefaultJSONProvider
 
 from backtest_engine import BacktestEngine
 from config_manager import ConfigManager
@@ -14,8 +16,45 @@ from espn_adapter import ESPNAdapter
 from performance_tracker import PerformanceTracker
 from predictipulse_engine import PredictipulseEngine
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
 app = Flask(__name__)
 
+if orjson is not None:
+
+    class OrjsonProvider(DefaultJSONProvider):
+        """Flask JSON provider backed by orjson; unknown types fall back to Flask's ``default``."""
+
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+        def loads(self, s: Any, **kwargs: Any) -> Any:
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+
+try:
+    from flask_compress import Compress
+
+    app.config.update(
+        COMPRESS_ALGORITHM=["br", "gzip"],
+        COMPRESS_MIN_SIZE=1024,
+        # text/event-stream is deliberately absent: SSE frames must not be buffered
+        COMPRESS_MIMETYPES=["application/json", "text/html", "text/css", "application/javascript"],
+        COMPRESS_STREAMS=False,
+    )
+    Compress(app)
+except ImportError:  # pragma: no cover - optional dependency
+    pass
+
 
 # Custom Jinja filter for timestamps
 @app.template_filter("timestamp_fmt")
@@ -34,33 +73,99 @@ engine = PredictipulseEngine(
 )
 backtest_engine = BacktestEngine(espn_adapter=ESPNAdapter())
 
+# Backtests run off the request thread; progress is streamed over SSE
+backtest_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="backtest")
+backtest_jobs: Dict[str, Dict[str, Any]] = {}
+BACKTEST_JOB_TTL = 600  # seconds an unclaimed finished job is kept
+
 
 # ---------------------------------------------------------------------------
 # SSE helpers
 # ---------------------------------------------------------------------------
-def sse_format(data: str) -> str:
-    return f"data: {data}\n\n"
+# Streams block on the engine queues; an idle stream only wakes to send a
+# comment frame, which keeps proxies from timing out and surfaces dead clients.
+SSE_KEEPALIVE_SECONDS = 30.0
+SSE_KEEPALIVE = b": keepalive\n\n"
+# Log/opportunity bursts are coalesced into one event of up to this many items
+SSE_MAX_BATCH = 32
 
 
-def stream_logs() -> Iterable[str]:
+_SSE_DATA_PREFIX = b"data: "
+_SSE_EVENT_END = b"\n\n"
+
+
+def sse_format(data: bytes) -> bytes:
+    return b"".join((_SSE_DATA_PREFIX, data, _SSE_EVENT_END))
+
+
+def json_response(payload: Any) -> Response:
+    """Serialize large JSON payloads with orjson when available."""
+    return Response(_dumps(payload), mimetype="application/json")
+
+
+def stream_logs() -> Iterable[bytes]:
     while True:
-        log = engine.next_log(timeout=1.0)
-        if log:
-            yield sse_format(json.dumps({"log": log}))
+        logs = engine.next_logs(timeout=SSE_KEEPALIVE_SECONDS, max_items=SSE_MAX_BATCH)
+        yield sse_format(_dumps({"logs": logs})) if logs else SSE_KEEPALIVE
 
 
-def stream_opportunities() -> Iterable[str]:
+def stream_opportunities() -> Iterable[bytes]:
     while True:
-        opp = engine.next_opportunity(timeout=1.0)
-        if opp:
-            yield sse_format(json.dumps(opp))
+        opps = engine.next_opportunities(timeout=SSE_KEEPALIVE_SECONDS, max_items=SSE_MAX_BATCH)
+        yield sse_format(_dumps(opps)) if opps else SSE_KEEPALIVE
 
 
-def stream_trades() -> Iterable[str]:
+def stream_trades() -> Iterable[bytes]:
     while True:
-        trade = engine.next_trade(timeout=1.0)
-        if trade:
-            yield sse_format(json.dumps(trade))
+        trade = engine.next_trade(timeout=SSE_KEEPALIVE_SECONDS)
+        yield SSE_KEEPALIVE if trade is None else sse_format(_dumps(trade))
+
+
+def stream_backtest(backtest_id: str) -> Iterable[bytes]:
+    job = backtest_jobs.get(backtest_id)
+    if job is None:
+        yield sse_format(_dumps({"done": True, "error": f"Unknown backtest: {backtest_id}"}))
+        return
+
+    future: Future = job["future"]
+    last_progress = None
+    while True:
+        done, _ = wait([future], timeout=0.5)
+        progress = job["progress"]
+        if progress != last_progress:
+            last_progress = progress
+            yield sse_format(_dumps({"progress": progress[0], "total": progress[1]}))
+        if done:
+            break
+
+    backtest_jobs.pop(backtest_id, None)
+    try:
+        yield sse_format(_dumps({"done": True, "result": future.result()}))
+    except Exception as exc:
+        yield sse_format(_dumps({"done": True, "error": str(exc)}))
+
+
+def _run_backtest_job(backtest_id: str, job: Dict[str, Any], **params: Any) -> Dict[str, Any]:
+    def on_progress(done: int, total: int) -> None:
+        job["progress"] = (done, total)
+
+    result = backtest_engine.run_backtest(progress=on_progress, **params)
+    performance_tracker.store_backtest(
+        backtest_id=backtest_id,
+        sports=params["sports"],
+        start_date=params["start_date"],
+        end_date=params["end_date"],
+        summary=result["summary"],
+    )
+    result["id"] = backtest_id
+    return result
+
+
+def _prune_backtest_jobs() -> None:
+    cutoff = time.time() - BACKTEST_JOB_TTL
+    for backtest_id, job in list(backtest_jobs.items()):
+        if job["future"].done() and job["created"] < cutoff:
+            backtest_jobs.pop(backtest_id, None)
 
 
 # ---------------------------------------------------------------------------
@@ -217,7 +322,7 @@ def api_coinbase_trades():
 
 @app.route("/api/trades", methods=["GET"])
 def api_trades():
-    return jsonify(engine.get_recent_trades(50))
+    return json_response(engine.get_recent_trades(50))
 
 
 @app.route("/api/config", methods=["GET", "POST"])
@@ -225,7 +330,10 @@ def api_config():
     if request.method == "GET":
         return jsonify(config_manager.load())
     data: Dict[str, Any] = request.get_json(force=True) or {}
-    config_manager.save(data)
+    try:
+        config_manager.save(data)
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
     engine.update_config(data)
     return jsonify({"ok": True, "config": engine.get_config()})
 
@@ -235,7 +343,7 @@ def api_performance():
     source = request.args.get("source", "paper")
     metrics = performance_tracker.get_rolling_metrics(days=7, source=source)
     history = performance_tracker.get_history(limit=30, source=source)
-    return jsonify({"metrics": metrics, "history": history})
+    return json_response({"metrics": metrics, "history": history})
 
 
 @app.route("/api/backtest", methods=["POST"])
@@ -250,7 +358,13 @@ def api_backtest():
     edge_threshold = float(payload.get("edge_threshold") or 0.05)
     starting_balance = float(payload.get("starting_balance") or 1000.0)
 
-    result = backtest_engine.run_backtest(
+    _prune_backtest_jobs()
+    backtest_id = f"bt-{int(time.time() * 1000)}"
+    job: Dict[str, Any] = {"created": time.time(), "progress": (0, len(sports))}
+    job["future"] = backtest_executor.submit(
+        _run_backtest_job,
+        backtest_id,
+        job,
         sports=sports,
         start_date=start_date,
         end_date=end_date,
@@ -258,16 +372,8 @@ def api_backtest():
         edge_threshold=edge_threshold,
         starting_balance=starting_balance,
     )
-    backtest_id = f"bt-{int(time.time())}"
-    performance_tracker.store_backtest(
-        backtest_id=backtest_id,
-        sports=sports,
-        start_date=start_date,
-        end_date=end_date,
-        summary=result["summary"],
-    )
-    result["id"] = backtest_id
-    return jsonify(result)
+    backtest_jobs[backtest_id] = job
+    return jsonify({"id": backtest_id, "status": "running"}), 202
 
 
 @app.route("/api/backtest/history", methods=["GET"])
@@ -275,6 +381,15 @@ def api_backtest_history():
     return jsonify(performance_tracker.list_backtests(limit=20))
 
 
+@app.route("/stream/backtest/<backtest_id>")
+def api_stream_backtest(backtest_id: str):
+    return Response(
+        stream_backtest(backtest_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @app.route("/stream/logs")
 def api_stream_logs():
     return Response(
@@ -3,12 +3,18 @@
 from __future__ import annotations
 
 import datetime as _dt
+import json
+import logging
 import math
-import random
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from espn_adapter import ESPNAdapter
+import numpy as np
+
+from espn_adapter import HISTORICAL_AFTER_DAYS, SPORT_PATHS, ESPNAdapter
+
+logger = logging.getLogger("predictipulse.backtest")
 
 
 def _parse_date(date_str: str) -> _dt.date:
@@ -18,8 +24,68 @@ def _parse_date(date_str: str) -> _dt.date:
 class BacktestEngine:
     """Lightweight backtester that replays games and scores bets."""
 
-    def __init__(self, espn_adapter: Optional[ESPNAdapter] = None) -> None:
+    def __init__(
+        self,
+        espn_adapter: Optional[ESPNAdapter] = None,
+        cache_dir: Optional[str] = "cache/espn",
+    ) -> None:
         self.espn = espn_adapter or ESPNAdapter()
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._rng = np.random.default_rng()
+        # (sport, start, end) -> lookup; only complete, final ranges are stored
+        self._lookup_cache: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+
+    def get_winner_lookup(self, sport: str, start: _dt.date, end: _dt.date) -> Dict[str, str]:
+        """
+        Return matchup -> winner for the range, caching ranges whose results are final.
+
+        Days older than ``HISTORICAL_AFTER_DAYS`` no longer change (the same cutoff the
+        ESPN scoreboard cache uses), so such ranges are memoized in-process and persisted
+        to ``cache_dir`` -- but only when every day fetched successfully. Recent ranges,
+        ranges with a failed day and sports outside ``SPORT_PATHS`` are returned uncached;
+        the last check also keeps request-supplied names out of the cache file path.
+        """
+        sport_key = sport.lower()
+        if sport_key not in SPORT_PATHS or end >= _dt.date.today() - _dt.timedelta(days=HISTORICAL_AFTER_DAYS):
+            return self.espn.get_winner_lookup(sport, start, end)
+        key = (sport_key, start.isoformat(), end.isoformat())
+        lookup = self._lookup_cache.get(key)
+        if lookup is None:
+            lookup = self._read_lookup(key)
+        if lookup is None:
+            try:
+                lookup = self.espn.get_winner_lookup(sport, start, end, strict=True)
+            except Exception as exc:  # pragma: no cover - network
+                logger.warning("Incomplete ESPN results for %s %s..%s, not caching: %s", sport, start, end, exc)
+                return self.espn.get_winner_lookup(sport, start, end)
+            self._write_lookup(key, lookup)
+        self._lookup_cache[key] = lookup
+        return dict(lookup)
+
+    def _lookup_path(self, key: Tuple[str, str, str]) -> Optional[Path]:
+        return self.cache_dir / ("-".join(key) + ".json") if self.cache_dir else None
+
+    def _read_lookup(self, key: Tuple[str, str, str]) -> Optional[Dict[str, str]]:
+        path = self._lookup_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("Ignoring unreadable ESPN cache %s: %s", path, exc)
+            return None
+
+    def _write_lookup(self, key: Tuple[str, str, str], lookup: Dict[str, str]) -> None:
+        path = self._lookup_path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w", encoding="utf-8") as f:
+                json.dump(lookup, f)
+        except OSError as exc:
+            logger.warning("Could not persist ESPN cache %s: %s", path, exc)
 
     def run_backtest(
         self,
@@ -29,60 +95,100 @@ class BacktestEngine:
         stake: float = 10.0,
         edge_threshold: float = 0.05,
         starting_balance: float = 1000.0,
+        progress: Optional[Callable[[int, int], None]] = None,
     ) -> Dict[str, Any]:
+        """Replay games for each sport; ``progress(done, total)`` is called after each sport."""
         start = _parse_date(start_date)
         end = _parse_date(end_date)
         trades: List[Dict[str, Any]] = []
-
-        for sport in sports:
-            winner_lookup = self.espn.get_winner_lookup(sport, start, end)
-            for matchup, winner in winner_lookup.items():
-                home_team = matchup.split(" at ")[1]
-                away_team = matchup.split(" at ")[0]
-                # Simulated model probabilities
-                true_prob_home = random.uniform(0.45, 0.65)
-                market_prob_home = max(0.35, min(0.65, true_prob_home - random.uniform(0.02, 0.08)))
-                edge_home = true_prob_home - market_prob_home
-
-                selected_team = home_team if edge_home >= edge_threshold else away_team
-                true_prob = true_prob_home if selected_team == home_team else (1 - true_prob_home)
-                market_prob = market_prob_home if selected_team == home_team else (1 - market_prob_home)
-                edge = true_prob - market_prob
-
-                if edge < edge_threshold:
-                    continue
-
-                win = selected_team == winner
-                pnl = stake * (1 / market_prob - 1) if win else -stake
-                trades.append(
+        trades_append = trades.append
+        now = time.time()
+        id_prefix = "-" + str(int(now * 1000)) + "-"
+
+        for sport_index, sport in enumerate(sports, 1):
+            winner_lookup = self.get_winner_lookup(sport, start, end)
+            n = len(winner_lookup)
+            if not n:
+                if progress:
+                    progress(sport_index, len(sports))
+                continue
+            matchups = list(winner_lookup.keys())
+            winners = np.array(list(winner_lookup.values()), dtype=object)
+            home_teams = np.empty(n, dtype=object)
+            away_teams = np.empty(n, dtype=object)
+            for i, matchup in enumerate(matchups):
+                away_teams[i], _, home_teams[i] = matchup.partition(" at ")
+
+            # Simulated model probabilities, drawn for every matchup at once
+            true_prob_home = self._rng.uniform(0.45, 0.65, n)
+            market_prob_home = np.clip(true_prob_home - self._rng.uniform(0.02, 0.08, n), 0.35, 0.65)
+            edge_home = true_prob_home - market_prob_home
+
+            pick_home = edge_home >= edge_threshold
+            true_prob = np.where(pick_home, true_prob_home, 1 - true_prob_home)
+            market_prob = np.where(pick_home, market_prob_home, 1 - market_prob_home)
+            edge = true_prob - market_prob
+            selected = np.where(pick_home, home_teams, away_teams)
+            win = selected == winners
+            pnl = np.where(win, stake * (1 / market_prob - 1), -stake)
+
+            sport_prefix = "bt-" + sport + id_prefix
+            for i in np.flatnonzero(edge >= edge_threshold):
+                trades_append(
                     {
-                        "id": f"bt-{sport}-{int(time.time()*1000)}-{len(trades)}",
+                        "id": sport_prefix + str(len(trades)),
                         "sport": sport,
-                        "matchup": matchup,
-                        "team": selected_team,
-                        "timestamp": time.time(),
+                        "matchup": matchups[i],
+                        "team": selected[i],
+                        "timestamp": now,
                         "stake": round(stake, 2),
-                        "true_prob": round(true_prob, 3),
-                        "market_prob": round(market_prob, 3),
-                        "edge": round(edge * 100, 2),
-                        "result": "WIN" if win else "LOSS",
-                        "pnl": round(pnl, 2),
+                        "true_prob": round(float(true_prob[i]), 3),
+                        "market_prob": round(float(market_prob[i]), 3),
+                        "edge": round(float(edge[i]) * 100, 2),
+                        "result": "WIN" if win[i] else "LOSS",
+                        "pnl": round(float(pnl[i]), 2),
                     }
                 )
+            if progress:
+                progress(sport_index, len(sports))
 
         summary = self._summarize(trades, starting_balance)
         return {"summary": summary, "trades": trades}
 
     def _summarize(self, trades: List[Dict[str, Any]], starting_balance: float = 1000.0) -> Dict[str, Any]:
-        pnl_total = sum(t["pnl"] for t in trades)
-        wins = len([t for t in trades if t["pnl"] > 0])
-        losses = len([t for t in trades if t["pnl"] < 0])
-        stakes = sum(t["stake"] for t in trades)
+        pnl_total = 0.0
+        wins = 0
+        losses = 0
+        # Running balance for drawdown, Welford accumulators for per-stake returns
+        balance = peak = starting_balance
+        max_drawdown = 0.0
+        n_returns = 0
+        mean_return = 0.0
+        m2 = 0.0
+        for t in trades:
+            pnl = t["pnl"]
+            stake = t["stake"]
+            pnl_total += pnl
+            if pnl > 0:
+                wins += 1
+            elif pnl < 0:
+                losses += 1
+            balance += pnl
+            if balance > peak:
+                peak = balance
+            elif balance - peak < max_drawdown:
+                max_drawdown = balance - peak
+            if stake:
+                r = pnl / stake
+                n_returns += 1
+                delta = r - mean_return
+                mean_return += delta / n_returns
+                m2 += delta * (r - mean_return)
+
         # ROI based on starting balance
         roi = (pnl_total / starting_balance * 100) if starting_balance > 0 else 0.0
-        returns = [t["pnl"] / t["stake"] for t in trades if t["stake"]]
-        sharpe = (sum(returns) / len(returns)) / (self._stddev(returns) or 1) if returns else 0.0
-        max_drawdown = self._max_drawdown([t["pnl"] for t in trades], starting_balance)
+        stddev = math.sqrt(m2 / n_returns) if n_returns else 0.0
+        sharpe = mean_return / (stddev or 1) if n_returns else 0.0
         ending_balance = starting_balance + pnl_total
 
         return {
@@ -96,23 +202,3 @@ class BacktestEngine:
             "max_drawdown": round(max_drawdown, 2),
             "ending_balance": round(ending_balance, 2),
         }
-
-    @staticmethod
-    def _stddev(values: List[float]) -> float:
-        n = len(values)
-        if n == 0:
-            return 0.0
-        mean = sum(values) / n
-        variance = sum((v - mean) ** 2 for v in values) / n
-        return math.sqrt(variance)
-
-    @staticmethod
-    def _max_drawdown(pnls: List[float], starting_balance: float = 1000.0) -> float:
-        balance = starting_balance
-        peak = starting_balance
-        max_dd = 0.0
-        for pnl in pnls:
-            balance += pnl
-            peak = max(peak, balance)
-            max_dd = min(max_dd, balance - peak)
-        return max_dd
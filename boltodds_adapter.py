@@ -14,6 +14,11 @@ from typing import Any, Callable, Dict, List, Optional
 
 import requests
 
+try:
+    from orjson import loads as _loads
+except ImportError:  # pragma: no cover - optional speedup
+    from json import loads as _loads
+
 WS_URL = "wss://spro.agency/api"
 INFO_URL = "https://spro.agency/api/get_info"
 GAMES_URL = "https://spro.agency/api/get_games"
@@ -54,14 +59,16 @@ class BoltOddsClient:
         self.reconnect_seconds = reconnect_seconds
         self.on_message = on_message
         self._running = False
+        # Pooled keep-alive connections; the REST endpoints are polled every scan
+        self._http = requests.Session()
 
     def fetch_info(self) -> Dict[str, Any]:
-        resp = requests.get(INFO_URL, params={"key": self.api_key}, timeout=10)
+        resp = self._http.get(INFO_URL, params={"key": self.api_key}, timeout=10)
         resp.raise_for_status()
         return resp.json()
 
     def fetch_games(self) -> Dict[str, Any]:
-        resp = requests.get(GAMES_URL, params={"key": self.api_key}, timeout=10)
+        resp = self._http.get(GAMES_URL, params={"key": self.api_key}, timeout=10)
         resp.raise_for_status()
         return resp.json()
 
@@ -71,7 +78,7 @@ class BoltOddsClient:
             params["sports"] = ",".join(self.sports)
         if self.sportsbooks:
             params["sportsbooks"] = ",".join(self.sportsbooks)
-        resp = requests.get(MARKETS_URL, params=params, timeout=10)
+        resp = self._http.get(MARKETS_URL, params=params, timeout=10)
         resp.raise_for_status()
         return resp.json()
 
@@ -93,7 +100,7 @@ class BoltOddsClient:
     async def _handle_stream(self, websocket) -> None:
         async for raw_msg in websocket:
             try:
-                msg = json.loads(raw_msg)
+                msg = _loads(raw_msg)
             except json.JSONDecodeError:
                 continue
             if self.on_message:
@@ -107,16 +114,30 @@ class BoltOddsClient:
 
         self._running = True
         uri = f"{WS_URL}?key={self.api_key}"
-        while self._running:
+        # The async-iterator form of websockets.connect (websockets>=10) retries
+        # failed connection attempts with exponential backoff on its own.
+        async for websocket in websockets.connect(uri, ping_interval=20, compression="deflate"):
+            if not self._running:
+                await websocket.close()
+                break
             try:
-                async with websockets.connect(uri, ping_interval=20) as websocket:
-                    ack_message = await websocket.recv()
-                    logger.info("BoltOdds connected: %s", ack_message)
-                    await self._subscribe(websocket)
-                    await self._handle_stream(websocket)
-            except Exception as exc:  # pragma: no cover - network/runtime errors
+                ack_message = await websocket.recv()
+                logger.info("BoltOdds connected: %s", ack_message)
+                await self._subscribe(websocket)
+                await self._handle_stream(websocket)
+            except websockets.ConnectionClosed as exc:  # pragma: no cover - network
                 logger.warning("BoltOdds disconnected: %s", exc)
+            except Exception as exc:  # pragma: no cover - runtime errors
+                logger.warning("BoltOdds stream error: %s", exc)
+                await websocket.close()
                 await asyncio.sleep(self.reconnect_seconds)
+            if not self._running:
+                await websocket.close()
+                break
 
     def stop(self) -> None:
         self._running = False
+
+    def close(self) -> None:
+        """Release pooled HTTP connections."""
+        self._http.close()
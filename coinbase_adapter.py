@@ -27,19 +27,44 @@ Usage:
     markets = client.get_markets()
 """
 
+import functools
 import hashlib
 import hmac
 import logging
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
+import numpy as np
 import requests
 
 logger = logging.getLogger("predictipulse.coinbase")
 
+# Pre-encoded, upper-cased HTTP methods for request signing
+_METHOD_BYTES = {
+    m: m.upper().encode("ascii")
+    for m in ("GET", "POST", "PUT", "DELETE", "get", "post", "put", "delete")
+}
 
-@dataclass
+
+def _unavailable(return_value: Any) -> Callable:
+    """
+    Short-circuit a placeholder method while the API is unavailable.
+
+    ``return_value`` may be a value or a zero-arg factory (``list``, ``dict``) so
+    each call gets a fresh mutable result.
+    """
+    def deco(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrap(self: "CoinbaseClient", *args: Any, **kwargs: Any) -> Any:
+            if not self._available:
+                return return_value() if callable(return_value) else return_value
+            return fn(self, *args, **kwargs)
+        return wrap
+    return deco
+
+
+@dataclass(slots=True, frozen=True)
 class CoinbaseMarket:
     """Represents a Coinbase prediction market."""
     ticker: str
@@ -54,7 +79,33 @@ class CoinbaseMarket:
     category: str
 
 
-@dataclass
+# Column dtypes for the struct-of-arrays market layout (see get_markets_arrays).
+# Prices stay float64 so get_markets round-trips them exactly (float32 would not).
+MARKET_COLUMNS: Dict[str, Any] = {
+    "ticker": object,
+    "title": object,
+    "subtitle": object,
+    "yes_price": np.float64,
+    "no_price": np.float64,
+    "volume": np.int64,
+    "open_interest": np.int64,
+    "close_time": object,
+    "status": object,
+    "category": object,
+}
+
+
+def market_rows_to_arrays(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Fill one preallocated array per market field from raw API market dicts."""
+    n = len(rows)
+    cols = {name: np.empty(n, dtype=dtype) for name, dtype in MARKET_COLUMNS.items()}
+    for i, row in enumerate(rows):
+        for name, col in cols.items():
+            col[i] = row.get(name) or (0 if col.dtype != object else "")
+    return cols
+
+
+@dataclass(slots=True, frozen=True)
 class CoinbaseOrder:
     """Represents a Coinbase order."""
     order_id: str
@@ -65,7 +116,7 @@ class CoinbaseOrder:
     status: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CoinbasePosition:
     """Represents a Coinbase position."""
     ticker: str
@@ -105,6 +156,12 @@ class CoinbaseClient:
         self.api_key = api_key
         self.api_secret = api_secret
         self._available = False  # Will be True when API is available
+        self._session = requests.Session()  # Pooled connections for _request
+        # Keyed HMAC state computed once; each signature copies it instead of
+        # redoing the key schedule.
+        self._hmac_template = (
+            hmac.new(api_secret.encode(), digestmod=hashlib.sha256) if api_secret else None
+        )
         
         if api_key and api_secret:
             logger.info("Coinbase client initialized with credentials (API not yet available)")
@@ -117,17 +174,37 @@ class CoinbaseClient:
         
         This follows the typical Coinbase signing pattern - adjust when actual API docs available.
         """
-        if not self.api_secret:
+        if self._hmac_template is None:
             return ""
         
-        message = f"{timestamp}{method.upper()}{path}{body}"
-        signature = hmac.new(
-            self.api_secret.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        # Feed the HMAC piecewise rather than formatting one message string first
+        mac = self._hmac_template.copy()
+        mac.update(timestamp.encode("ascii"))
+        mac.update(_METHOD_BYTES.get(method) or method.upper().encode("ascii"))
+        mac.update(path.encode())
+        if body:
+            mac.update(body.encode() if isinstance(body, str) else body)
+        return mac.hexdigest()
+    
+    def _verify_signature(
+        self,
+        timestamp: str,
+        method: str,
+        path: str,
+        body: str,
+        received_sig: str,
+    ) -> bool:
+        """
+        Check a signature received from Coinbase against the expected HMAC.
         
-        return signature
+        All inbound signature checks must go through here: hmac.compare_digest
+        runs in constant time, so responses cannot be forged byte by byte via timing.
+        """
+        if self._hmac_template is None or not received_sig:
+            return False
+        expected = self._get_signature(timestamp, method, path, body)
+        # Compare bytes: with str arguments compare_digest raises TypeError on non-ASCII input
+        return hmac.compare_digest(expected.encode("ascii"), received_sig.encode("utf-8"))
     
     def _get_headers(self, method: str = "GET", path: str = "", body: str = "") -> Dict[str, str]:
         """Generate authentication headers."""
@@ -156,7 +233,7 @@ class CoinbaseClient:
         PLACEHOLDER: Currently returns empty dict as API is not available.
         """
         if not self._available:
-            logger.debug(f"Coinbase API not available - skipping {method} {endpoint}")
+            # Fast path: no logging here; unavailability is reported once at init
             return {}
         
         # When API is available, uncomment and update:
@@ -164,7 +241,7 @@ class CoinbaseClient:
         # body = json.dumps(json_data) if json_data else ""
         # headers = self._get_headers(method, endpoint, body)
         # 
-        # resp = requests.request(
+        # resp = self._session.request(
         #     method,
         #     url,
         #     headers=headers,
@@ -176,6 +253,10 @@ class CoinbaseClient:
         
         return {}
     
+    def close(self) -> None:
+        """Release pooled HTTP connections."""
+        self._session.close()
+    
     # -------------------------------------------------------------------------
     # Account Methods
     # -------------------------------------------------------------------------
@@ -240,13 +321,44 @@ class CoinbaseClient:
             limit: Maximum number of markets to return
         
         Returns:
-            List of CoinbaseMarket objects
+            List of CoinbaseMarket objects, built from get_markets_arrays()
         
         PLACEHOLDER: Returns empty list.
         """
-        logger.info(f"Coinbase: get_markets called (API not yet available) - category={category}")
-        return []
+        cols = self.get_markets_arrays(category=category, status=status, limit=limit)
+        # Field order of MARKET_COLUMNS matches the CoinbaseMarket constructor
+        return [
+            CoinbaseMarket(*row)
+            for row in zip(*(cols[name].tolist() for name in MARKET_COLUMNS))
+        ]
+    
+    @_unavailable(return_value=lambda: market_rows_to_arrays([]))
+    def get_markets_arrays(
+        self,
+        category: Optional[str] = None,
+        status: str = "open",
+        limit: int = 100,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get available prediction markets as columns (one array per CoinbaseMarket field).
+        
+        Numeric columns are contiguous NumPy arrays so EV screening can filter
+        thousands of markets with array ops instead of a per-market Python loop.
+        
+        Args:
+            category: Filter by category (e.g., "sports", "politics", "crypto")
+            status: Market status ("open", "closed", "settled")
+            limit: Maximum number of markets to return
+        
+        Returns:
+            Dict mapping each MARKET_COLUMNS field to an array of length n
+        
+        PLACEHOLDER: Returns zero-length arrays.
+        """
+        logger.info("Coinbase: get_markets called (API not yet available) - category=%s", category)
+        return market_rows_to_arrays([])
     
+    @_unavailable(return_value=list)
     def get_sports_markets(self) -> List[CoinbaseMarket]:
         """
         Get all open sports-related markets.
@@ -259,6 +371,7 @@ class CoinbaseClient:
         logger.info("Coinbase: get_sports_markets called (API not yet available)")
         return []
     
+    @_unavailable(return_value=None)
     def get_market(self, ticker: str) -> Optional[CoinbaseMarket]:
         """
         Get a specific market by ticker.
@@ -271,9 +384,10 @@ class CoinbaseClient:
         
         PLACEHOLDER: Returns None.
         """
-        logger.info(f"Coinbase: get_market called for {ticker} (API not yet available)")
+        logger.info("Coinbase: get_market called for %s (API not yet available)", ticker)
         return None
     
+    @_unavailable(return_value=lambda: {"yes_bid": 0, "yes_ask": 0, "no_bid": 0, "no_ask": 0, "last_price": 0})
     def get_market_prices(self, ticker: str) -> Dict[str, Any]:
         """
         Get current prices for a market.
@@ -293,7 +407,7 @@ class CoinbaseClient:
         
         PLACEHOLDER: Returns empty prices.
         """
-        logger.info(f"Coinbase: get_market_prices called for {ticker} (API not yet available)")
+        logger.info("Coinbase: get_market_prices called for %s (API not yet available)", ticker)
         return {
             "yes_bid": 0,
             "yes_ask": 0,
@@ -302,6 +416,7 @@ class CoinbaseClient:
             "last_price": 0,
         }
     
+    @_unavailable(return_value=lambda: {"yes": [], "no": []})
     def get_orderbook(self, ticker: str, depth: int = 10) -> Dict[str, Any]:
         """
         Get orderbook for a market.
@@ -319,13 +434,14 @@ class CoinbaseClient:
         
         PLACEHOLDER: Returns empty orderbook.
         """
-        logger.info(f"Coinbase: get_orderbook called for {ticker} (API not yet available)")
+        logger.info("Coinbase: get_orderbook called for %s (API not yet available)", ticker)
         return {"yes": [], "no": []}
     
     # -------------------------------------------------------------------------
     # Trading Methods
     # -------------------------------------------------------------------------
     
+    @_unavailable(return_value=None)
     def place_order(
         self,
         ticker: str,
@@ -352,11 +468,38 @@ class CoinbaseClient:
         PLACEHOLDER: Returns None and logs warning.
         """
         logger.warning(
-            f"Coinbase: place_order called (API not yet available) - "
-            f"ticker={ticker}, side={side}, price={price}, size={size}"
+            "Coinbase: place_order called (API not yet available) - "
+            "ticker=%s, side=%s, price=%s, size=%s",
+            ticker, side, price, size,
         )
         return None
     
+    def place_orders_bulk(self, orders: List[Dict[str, Any]]) -> List[Optional[CoinbaseOrder]]:
+        """
+        Place several orders in one call. Preferred over looping place_order from strategy code.
+        
+        Args:
+            orders: List of place_order keyword dicts (ticker, side, price, size, ...)
+        
+        Returns:
+            One CoinbaseOrder (or None if failed) per input order, in order
+        
+        PLACEHOLDER: Returns None for every order.
+        """
+        if not self._available:
+            return [None] * len(orders)
+        
+        # When a batch endpoint is available, send one POST signed once over the batch:
+        # body = json.dumps({"orders": orders})
+        # headers = self._get_headers("POST", "/orders/batch", body)
+        # resp = self._session.post(f"{self.PREDICTION_URL}/orders/batch", data=body, headers=headers)
+        # resp.raise_for_status()
+        # return [CoinbaseOrder(**o) for o in resp.json().get("orders", [])]
+        
+        # Until then, loop over the pooled session; each signature copies the cached HMAC state
+        return [self.place_order(**order) for order in orders]
+    
+    @_unavailable(return_value=False)
     def cancel_order(self, order_id: str) -> bool:
         """
         Cancel an open order.
@@ -369,9 +512,10 @@ class CoinbaseClient:
         
         PLACEHOLDER: Returns False.
         """
-        logger.warning(f"Coinbase: cancel_order called for {order_id} (API not yet available)")
+        logger.warning("Coinbase: cancel_order called for %s (API not yet available)", order_id)
         return False
     
+    @_unavailable(return_value=list)
     def get_orders(self, status: str = "open") -> List[CoinbaseOrder]:
         """
         Get orders by status.
@@ -384,13 +528,14 @@ class CoinbaseClient:
         
         PLACEHOLDER: Returns empty list.
         """
-        logger.info(f"Coinbase: get_orders called with status={status} (API not yet available)")
+        logger.info("Coinbase: get_orders called with status=%s (API not yet available)", status)
         return []
     
     # -------------------------------------------------------------------------
     # Position Methods
     # -------------------------------------------------------------------------
     
+    @_unavailable(return_value=list)
     def get_positions(self) -> List[Dict[str, Any]]:
         """
         Get current open positions.
@@ -412,6 +557,7 @@ class CoinbaseClient:
         logger.info("Coinbase: get_positions called (API not yet available)")
         return []
     
+    @_unavailable(return_value=list)
     def get_trades(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Get trade history.
@@ -424,7 +570,7 @@ class CoinbaseClient:
         
         PLACEHOLDER: Returns empty list.
         """
-        logger.info(f"Coinbase: get_trades called with limit={limit} (API not yet available)")
+        logger.info("Coinbase: get_trades called with limit=%s (API not yet available)", limit)
         return []
     
     # -------------------------------------------------------------------------
@@ -1,11 +1,22 @@
 """Configuration manager for Predictipulse."""
 
+import copy
 import json
+import os
+import tempfile
 from pathlib import Path
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
-DEFAULT_CONFIG: Dict[str, Any] = {
+
+# Read-only at the top level only (the "sports" list is still mutable), so merge
+# through _defaults() rather than {**DEFAULT_CONFIG, ...}
+DEFAULT_CONFIG: Mapping[str, Any] = MappingProxyType({
     "kelly_multiplier": 0.5,
     "target_buy_ev": 0.05,
     "target_sell_ev": 0.05,
@@ -19,7 +30,20 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "boltodds_api_key": "",  # Add your BoltOdds API key here
     "coinbase_api_key": "",  # Coinbase Prediction Markets API key (when available)
     "coinbase_api_secret": "",  # Coinbase Prediction Markets API secret (when available)
-}
+    "trade_history_cap": 10_000,  # Trades kept in memory; read at engine startup only
+})
+
+
+def validate(config: Mapping[str, Any]) -> None:
+    """Raise ValueError for settings the engine cannot run with."""
+    cap = config.get("trade_history_cap", DEFAULT_CONFIG["trade_history_cap"])
+    if isinstance(cap, bool) or not isinstance(cap, int) or cap < 1:
+        raise ValueError(f"trade_history_cap must be an integer >= 1, got {cap!r}")
+
+
+def _defaults() -> Dict[str, Any]:
+    """A private deep copy of DEFAULT_CONFIG, safe to merge into and hand out."""
+    return copy.deepcopy(dict(DEFAULT_CONFIG))
 
 
 class ConfigManager:
@@ -27,25 +51,68 @@ class ConfigManager:
 
     def __init__(self, path: str = "config.json"):
         self.path = Path(path)
+        # ((st_mtime_ns, st_size), merged config) as last read or written; load()
+        # only re-parses when the file's stat signature changes.
+        self._cached: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
+    def _stat_key(self) -> Tuple[int, int]:
+        st = self.path.stat()
+        return st.st_mtime_ns, st.st_size
 
     def load(self) -> Dict[str, Any]:
         """Load config from file, creating with defaults if not exists."""
-        if not self.path.exists():
-            self.save(DEFAULT_CONFIG)
-            return dict(DEFAULT_CONFIG)
-        with self.path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        try:
+            key = self._stat_key()
+        except FileNotFoundError:
+            return self.reset()
+        # Deep copies: callers may mutate nested values such as the sports list
+        if self._cached is not None and self._cached[0] == key:
+            return copy.deepcopy(self._cached[1])
+        raw = self.path.read_bytes()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
         # Merge defaults for any missing keys
-        merged = dict(DEFAULT_CONFIG)
-        merged.update(data)
-        return merged
+        merged = {**_defaults(), **data}
+        validate(merged)
+        self._cached = (key, merged)
+        return copy.deepcopy(merged)
+
+    def save(self, config: Mapping[str, Any], durable: bool = False) -> None:
+        """
+        Save config to file atomically.
 
-    def save(self, config: Dict[str, Any]) -> None:
-        """Save config to file."""
-        with self.path.open("w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2)
+        The new contents are written to a sibling temp file and renamed over the
+        config, so a crash mid-write never leaves a truncated file behind. Pass
+        ``durable=True`` to fsync before the rename.
+        """
+        validate(config)
+        if not isinstance(config, dict):
+            config = dict(config)  # orjson cannot serialize read-only mappings
+        if orjson:
+            data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(config, indent=2).encode("utf-8")
+        # Unique temp name in the same directory, so concurrent saves never share a
+        # file and os.replace stays a same-filesystem rename
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(self.path)), prefix=self.path.name + ".", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        # Prime the cache with what was just written so the next load() is free
+        self._cached = (self._stat_key(), copy.deepcopy({**DEFAULT_CONFIG, **config}))
 
     def reset(self) -> Dict[str, Any]:
         """Reset config to defaults."""
         self.save(DEFAULT_CONFIG)
-        return dict(DEFAULT_CONFIG)
+        return _defaults()
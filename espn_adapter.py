@@ -6,11 +6,29 @@ Lightweight wrapper over public ESPN scoreboards. No auth required.
 from __future__ import annotations
 
 import datetime as _dt
+import functools
+import gzip
+import hashlib
+import itertools
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:  # pragma: no cover - optional speedup
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
 
 logger = logging.getLogger("predictipulse.espn")
 
@@ -23,127 +41,282 @@ SPORT_PATHS = {
 }
 
 
+# Scoreboard cache lifetimes (seconds). Days older than HISTORICAL_AFTER_DAYS are
+# final and cached forever; recent days can still change (late games, stat fixes).
+LIVE_TTL = 60.0
+RECENT_TTL = 3600.0
+HISTORICAL_AFTER_DAYS = 2
+
+
 def _date_str(day: _dt.date) -> str:
-    return day.strftime("%Y%m%d")
+    # Plain int formatting; strftime is several times slower per call
+    return "%04d%02d%02d" % (day.year, day.month, day.day)
+
+
+def _scoreboard_ttl(day: _dt.date) -> Optional[float]:
+    """Return the cache TTL for a scoreboard day, or None if it never expires."""
+    today = _dt.date.today()
+    if day < today - _dt.timedelta(days=HISTORICAL_AFTER_DAYS):
+        return None
+    if day < today:
+        return RECENT_TTL
+    return LIVE_TTL
+
+
+@functools.lru_cache(maxsize=4096)
+def _build_scoreboard_url(sport: str, day: _dt.date) -> str:
+    """Scoreboard URL for one sport/day; memoized since backtests revisit the same days."""
+    sport_path = SPORT_PATHS.get(sport.lower())
+    if not sport_path:
+        raise ValueError(f"Unsupported sport for ESPN: {sport}")
+    cat, league = sport_path
+    date_str = _date_str(day)
+    # Use the v2 site API which is more reliable
+    return f"https://site.api.espn.com/apis/site/v2/sports/{cat}/{league}/scoreboard?dates={date_str}"
+
+
+class GameRecord(NamedTuple):
+    """One simplified ESPN game; flat so each record is a single tuple, not nested dicts."""
+
+    id: Optional[str]
+    name: Optional[str]
+    date: Optional[str]
+    home_team: str
+    home_score: float
+    home_winner: bool
+    home_record: str
+    away_team: str
+    away_score: float
+    away_winner: bool
+    away_record: str
+    completed: bool
+    spread: Optional[str]
+    home_favorite: Optional[bool]
+    spread_points: Optional[float]
+
+
+def _team_fields(entry: Dict[str, Any]) -> Tuple[str, float, bool, str]:
+    """Simplify one ESPN competitor entry to (team name, score, winner flag, record)."""
+    team_info = entry.get("team") or {}
+    record = entry.get("records") or entry.get("record")
+    record_str = ""
+    if record and isinstance(record, list):
+        rec = record[0]
+        if isinstance(rec, dict):
+            record_str = rec.get("summary", "")
+        elif isinstance(rec, str):
+            record_str = rec
+    return (
+        team_info.get("displayName") or "Unknown",
+        float(entry.get("score") or 0),
+        bool(entry.get("winner")),
+        record_str,
+    )
+
+
+def _parse_scoreboard(data: Dict[str, Any]) -> List[GameRecord]:
+    """Simplify a raw scoreboard payload to game records with scores and winner flag."""
+    events = data.get("events", []) or []
+    games: List[GameRecord] = []
+    for ev in events:
+        competitions = ev.get("competitions") or []
+        if not competitions:
+            continue
+        comp = competitions[0]
+        competitors = comp.get("competitors") or []
+        if len(competitors) < 2:
+            continue
+        home = away = None
+        for c in competitors:
+            side = c.get("homeAway")
+            if side == "home" and home is None:
+                home = c
+            elif side == "away" and away is None:
+                away = c
+        if home is None:
+            home = competitors[0]
+        if away is None:
+            away = competitors[1]
+
+        odds = (comp.get("odds") or [{}])[0]
+        games.append(
+            GameRecord(
+                ev.get("id"),
+                ev.get("name"),
+                ev.get("date"),
+                *_team_fields(home),
+                *_team_fields(away),
+                comp.get("status", {}).get("type", {}).get("completed", False),
+                odds.get("details"),
+                odds.get("homeTeamOdds", {}).get("favorite"),
+                odds.get("spread"),
+            )
+        )
+    return games
+
+
+def _winner_lookup(games: List[GameRecord]) -> Dict[str, str]:
+    """Map "Away at Home" matchup keys to the winning team name."""
+    return {
+        g.away_team + " at " + g.home_team: g.home_team if g.home_winner else g.away_team
+        for g in games
+    }
 
 
 class ESPNAdapter:
     """Fetch game results and basic odds from ESPN public endpoints."""
 
-    def __init__(self, timeout: float = 8.0) -> None:
+    def __init__(
+        self,
+        timeout: float = 8.0,
+        max_workers: int = 8,
+        cache_dir: Optional[str] = "cache/espn/scoreboards",
+    ) -> None:
         self.timeout = timeout
-        self._scoreboard_cache: Dict[str, Dict[str, Any]] = {}
-
-    @staticmethod
-    def _build_scoreboard_url(sport: str, day: _dt.date) -> str:
-        sport_path = SPORT_PATHS.get(sport.lower())
-        if not sport_path:
-            raise ValueError(f"Unsupported sport for ESPN: {sport}")
-        cat, league = sport_path
-        date_str = _date_str(day)
-        # Use the v2 site API which is more reliable
-        return f"https://site.api.espn.com/apis/site/v2/sports/{cat}/{league}/scoreboard?dates={date_str}"
+        self.max_workers = max_workers
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        # cache_key -> (expires_at, payload); expires_at is inf for final days
+        self._scoreboard_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._cache_lock = threading.Lock()
+        # Keep-alive session so date-range fetches reuse TCP/TLS connections
+        self._session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+
+    def close(self) -> None:
+        """Release pooled HTTP connections."""
+        self._session.close()
 
     def fetch_scoreboard(self, sport: str, day: _dt.date) -> Dict[str, Any]:
-        """Fetch raw scoreboard JSON with a small in-memory cache."""
+        """Fetch raw scoreboard JSON, cached in memory and on disk per ``_scoreboard_ttl``."""
         cache_key = f"{sport}:{_date_str(day)}"
-        if cache_key in self._scoreboard_cache:
-            return self._scoreboard_cache[cache_key]
+        now = time.time()
+        payload = self._cached_scoreboard(cache_key, day, now)
+        if payload is None:
+            resp = self._session.get(_build_scoreboard_url(sport, day), timeout=self.timeout)
+            resp.raise_for_status()
+            payload = self._store_scoreboard(cache_key, day, resp.content, now)
+        return payload
 
-        url = self._build_scoreboard_url(sport, day)
-        resp = requests.get(url, timeout=self.timeout)
-        resp.raise_for_status()
+    def _cached_scoreboard(self, cache_key: str, day: _dt.date, now: float) -> Optional[Dict[str, Any]]:
+        """Return a live cached payload from memory or disk, or None on a miss."""
+        with self._cache_lock:
+            cached = self._scoreboard_cache.get(cache_key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        payload = self._read_disk_cache(cache_key, now)
+        if payload is not None:
+            self._remember(cache_key, day, payload, now)
+        return payload
+
+    def _store_scoreboard(self, cache_key: str, day: _dt.date, raw: bytes, now: float) -> Dict[str, Any]:
+        """Parse a fetched scoreboard body and cache it in memory and on disk."""
         try:
-            payload = resp.json()
-            self._scoreboard_cache[cache_key] = payload
-            return payload
+            payload = _loads(raw)
         except json.JSONDecodeError as exc:  # pragma: no cover - network
             raise ValueError("Failed to parse ESPN response") from exc
+        self._write_disk_cache(cache_key, payload, now, _scoreboard_ttl(day))
+        self._remember(cache_key, day, payload, now)
+        return payload
+
+    def _remember(self, cache_key: str, day: _dt.date, payload: Dict[str, Any], now: float) -> None:
+        ttl = _scoreboard_ttl(day)
+        expires_at = float("inf") if ttl is None else now + ttl
+        with self._cache_lock:
+            self._scoreboard_cache[cache_key] = (expires_at, payload)
+
+    def clear_cache(self) -> None:
+        """Drop all cached scoreboards, in memory and on disk."""
+        with self._cache_lock:
+            self._scoreboard_cache.clear()
+        if self.cache_dir and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.json*"):
+                path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------ #
+    # Disk cache: gzip'd payload plus a small {"ts", "ttl"} sidecar
+    # ------------------------------------------------------------------ #
+    def _cache_paths(self, cache_key: str) -> Tuple[Path, Path]:
+        digest = hashlib.sha1(cache_key.encode()).hexdigest()
+        return self.cache_dir / f"{digest}.json.gz", self.cache_dir / f"{digest}.meta.json"
+
+    def _read_disk_cache(self, cache_key: str, now: float) -> Optional[Dict[str, Any]]:
+        if not self.cache_dir:
+            return None
+        data_path, meta_path = self._cache_paths(cache_key)
+        try:
+            meta = _loads(meta_path.read_bytes())
+            ttl = meta.get("ttl")
+            if ttl is not None and meta["ts"] + ttl <= now:
+                return None
+            with gzip.open(data_path, "rb") as f:
+                return _loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Ignoring unreadable ESPN cache entry %s: %s", cache_key, exc)
+            return None
 
-    def get_games(self, sport: str, day: _dt.date) -> List[Dict[str, Any]]:
-        """Return simplified game records with scores and winner flag."""
+    def _write_disk_cache(
+        self, cache_key: str, payload: Dict[str, Any], now: float, ttl: Optional[float]
+    ) -> None:
+        if not self.cache_dir:
+            return
+        data_path, meta_path = self._cache_paths(cache_key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with gzip.open(data_path, "wb") as f:
+                f.write(_dumps(payload))
+            # Sidecar last, so a present sidecar always refers to a complete payload
+            meta_path.write_bytes(_dumps({"ts": now, "ttl": ttl}))
+        except OSError as exc:
+            logger.warning("Could not write ESPN cache entry %s: %s", cache_key, exc)
+
+    def get_games(self, sport: str, day: _dt.date, strict: bool = False) -> List[GameRecord]:
+        """
+        Return simplified game records with scores and winner flag.
+
+        Fetch errors are logged and yield no games unless ``strict`` is set, in which
+        case they propagate so callers can tell an empty day from a failed one.
+        """
         try:
             data = self.fetch_scoreboard(sport, day)
         except Exception as exc:  # pragma: no cover - network
+            if strict:
+                raise
             logger.warning("ESPN fetch failed for %s %s: %s", sport, day, exc)
             return []
+        return _parse_scoreboard(data)
 
-        events = data.get("events", []) or []
-        games: List[Dict[str, Any]] = []
-        for ev in events:
-            competitions = ev.get("competitions") or []
-            if not competitions:
-                continue
-            comp = competitions[0]
-            competitors = comp.get("competitors") or []
-            if len(competitors) < 2:
-                continue
-            home = next((c for c in competitors if c.get("homeAway") == "home"), competitors[0])
-            away = next((c for c in competitors if c.get("homeAway") == "away"), competitors[1])
-
-            def _team_payload(entry: Dict[str, Any]) -> Dict[str, Any]:
-                score = float(entry.get("score") or 0)
-                team = (entry.get("team") or {}).get("displayName") or "Unknown"
-                record = entry.get("records") or entry.get("record") or []
-                record_str = ""
-                if record and isinstance(record, list) and len(record) > 0:
-                    rec = record[0]
-                    if isinstance(rec, dict):
-                        record_str = rec.get("summary", "")
-                    elif isinstance(rec, str):
-                        record_str = rec
-                return {
-                    "team": team,
-                    "score": score,
-                    "winner": bool(entry.get("winner")),
-                    "record": record_str,
-                }
-
-            odds = (comp.get("odds") or [{}])[0]
-            games.append(
-                {
-                    "id": ev.get("id"),
-                    "name": ev.get("name"),
-                    "date": ev.get("date"),
-                    "home": _team_payload(home),
-                    "away": _team_payload(away),
-                    "completed": comp.get("status", {}).get("type", {}).get("completed", False),
-                    "spread": odds.get("details"),
-                    "home_favorite": odds.get("homeTeamOdds", {}).get("favorite"),
-                    "spread_points": odds.get("spread"),
-                }
-            )
-        return games
-
-    def get_results_range(self, sport: str, start: _dt.date, end: _dt.date) -> List[Dict[str, Any]]:
-        """Fetch games for date range inclusive."""
+    def get_results_range(
+        self, sport: str, start: _dt.date, end: _dt.date, strict: bool = False
+    ) -> List[GameRecord]:
+        """Fetch games for date range inclusive; ``strict`` raises if any day fails."""
         days = (end - start).days
         if days < 0:
             raise ValueError("end date must be >= start date")
 
-        results: List[Dict[str, Any]] = []
-        for i in range(days + 1):
-            day = start + _dt.timedelta(days=i)
-            results.extend(self.get_games(sport, day))
-        return results
+        first = start.toordinal()
+        day_list = [_dt.date.fromordinal(first + i) for i in range(days + 1)]
+        if len(day_list) == 1 or self.max_workers <= 1:
+            return [game for day in day_list for game in self.get_games(sport, day, strict)]
+
+        # Each day is an independent request; fan out over the pooled session
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(day_list))) as pool:
+            per_day = pool.map(lambda day: self.get_games(sport, day, strict), day_list)
+            return list(itertools.chain.from_iterable(per_day))
 
     def get_winner_lookup(
         self,
         sport: str,
         start: _dt.date,
         end: _dt.date,
+        strict: bool = False,
     ) -> Dict[str, str]:
         """
         Build a lookup of matchup -> winning team name for quick scoring in backtests.
 
         The matchup key is formatted as "Away at Home" to align with edge detection.
+        With ``strict`` a failed day raises instead of silently dropping its games.
         """
-        lookup: Dict[str, str] = {}
-        for game in self.get_results_range(sport, start, end):
-            home = game.get("home", {}).get("team") or "Home"
-            away = game.get("away", {}).get("team") or "Away"
-            winner = home if game.get("home", {}).get("winner") else away
-            matchup = f"{away} at {home}"
-            lookup[matchup] = winner
-        return lookup
-
+        return _winner_lookup(self.get_results_range(sport, start, end, strict))
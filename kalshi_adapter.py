@@ -22,25 +22,78 @@ Usage:
 """
 
 import hashlib
+import json
 import os
+import re
 import socket
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import base64
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - optional speedup
+    ahocorasick = None
+
+try:
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:  # pragma: no cover - optional speedup
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
+
+try:
+    from pybase64 import b64encode_as_string as _b64encode_str
+except ImportError:  # pragma: no cover - optional speedup
+    def _b64encode_str(data: bytes) -> str:
+        return base64.b64encode(data).decode("ascii")
 
 try:
     from cryptography.hazmat.primitives import hashes, serialization
-    from cryptography.hazmat.primitives.asymmetric import padding
+    from cryptography.hazmat.primitives.asymmetric import padding, rsa
     from cryptography.hazmat.backends import default_backend
     HAS_CRYPTO = True
 except ImportError:
     HAS_CRYPTO = False
 
 
+# host -> (monotonic expiry, resolved?) so repeated KalshiClient() construction
+# skips getaddrinfo. Failures expire quickly so a network blip is retried soon.
+DNS_CACHE_TTL = 900.0
+DNS_NEGATIVE_TTL = 30.0
+_DNS_CACHE: Dict[str, Tuple[float, bool]] = {}
+
+# The set of open sports events changes over hours, so get_sports_markets reuses the
+# filtered event list for this long; market prices are still fetched on every call.
+SPORTS_EVENTS_TTL = 300.0
+
+
+def _load_private_key(pem: str) -> "rsa.RSAPrivateKey":
+    """
+    Parse a Kalshi RSA private key.
+
+    Called once per client, which keeps the key object; deliberately not memoized,
+    so the PEM text is not retained as a cache key. Keys without CRT components
+    (p, q, dmp1, dmq1, iqmp) are rejected, since signing without them is several
+    times slower.
+    """
+    key = serialization.load_pem_private_key(pem.encode(), password=None, backend=default_backend())
+    if not isinstance(key, rsa.RSAPrivateKey):
+        raise ValueError("Kalshi API secret must be an RSA private key")
+    numbers = key.private_numbers()
+    if not (numbers.p and numbers.q and numbers.dmp1 and numbers.dmq1 and numbers.iqmp):
+        raise ValueError("Kalshi RSA key lacks CRT parameters; regenerate it as a standard PKCS#1/PKCS#8 key")
+    return key
+
+
 @dataclass
 class KalshiMarket:
     ticker: str
@@ -91,6 +144,10 @@ class KalshiClient:
     DEMO_URL_CANDIDATES = [
         "https://demo-api.kalshi.co/trade-api/v2",
     ]
+
+    _BASE_HEADERS = {"Content-Type": "application/json"}
+    # Sports-related series keywords, matched anywhere in an event title in one regex pass
+    _SPORTS_RE = re.compile("NFL|NBA|MLB|NHL|SPORTS|SUPER|PLAYOFF", re.IGNORECASE)
     
     def __init__(
         self,
@@ -110,6 +167,9 @@ class KalshiClient:
         else:
             candidates = self.DEMO_URL_CANDIDATES if demo else self.PROD_URL_CANDIDATES
             self.base_url = self._select_base_url(candidates)
+        # Kalshi signs the request path including the /trade-api/v2 prefix; base_url
+        # carries that prefix, so resolve it once for _get_headers.
+        self._base_path = (urlparse(self.base_url).path or "").rstrip("/")
         self.email = email
         self.password = password
         self.api_key = api_key
@@ -119,7 +179,19 @@ class KalshiClient:
                 self.api_secret = Path(api_secret_path).read_text().strip()
             except FileNotFoundError as exc:
                 raise ValueError(f"API secret file not found at {api_secret_path}") from exc
+        # Keep-alive session so repeated calls reuse the TCP/TLS connection.
+        # Retry only covers idempotent methods, so orders are never resubmitted.
+        # raise_on_status=False hands the last response back once retries run out,
+        # so raise_for_status() still raises HTTPError rather than a RetryError.
+        self._session = requests.Session()
+        retry = Retry(
+            total=3, backoff_factor=0.1, status_forcelist=[429, 502, 503, 504], raise_on_status=False
+        )
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+        # (monotonic fetch time, events) for _get_sports_events
+        self._sports_events: Tuple[float, List[Dict[str, Any]]] = (0.0, [])
         self.token: Optional[str] = None
+        self._token_headers: Dict[str, str] = dict(self._BASE_HEADERS)  # rebuilt by _login
         self.token_expiry: float = 0
         self.member_id: Optional[str] = None
         
@@ -130,17 +202,34 @@ class KalshiClient:
         else:
             raise ValueError("Provide either (api_key, api_secret) or (email, password)")
 
+        # Parse the PEM once; _get_headers reuses the key object for every signature
+        self._private_key = None
+        if self._auth_method == "api_key" and HAS_CRYPTO and self.api_secret:
+            self._private_key = _load_private_key(self.api_secret)
+            # Kalshi's required RSA-PSS parameters, built once rather than per signature
+            self._pss_args = (
+                padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
+                hashes.SHA256(),
+            )
+            self.api_secret = None  # the loaded key is all signing needs
+
     @staticmethod
     def _host_resolves(base_url: str) -> bool:
-        """Return True if the hostname in base_url resolves via DNS."""
+        """Return True if the hostname in base_url resolves via DNS (cached per host)."""
         host = urlparse(base_url).hostname
         if not host:
             return False
+        now = time.monotonic()
+        cached = _DNS_CACHE.get(host)
+        if cached is not None and cached[0] > now:
+            return cached[1]
         try:
             socket.getaddrinfo(host, 443)
-            return True
+            ok = True
         except socket.gaierror:
-            return False
+            ok = False
+        _DNS_CACHE[host] = (now + (DNS_CACHE_TTL if ok else DNS_NEGATIVE_TTL), ok)
+        return ok
 
     @classmethod
     def _select_base_url(cls, candidates: List[str]) -> str:
@@ -161,55 +250,35 @@ class KalshiClient:
     
     def _get_headers(self, method: str = "GET", path: str = "") -> Dict[str, str]:
         """Generate authentication headers."""
-        headers = {"Content-Type": "application/json"}
-        
         if self._auth_method == "api_key":
             # RSA-PSS signature authentication
-            timestamp = str(int(time.time() * 1000))
-            # Kalshi signs the request path including the /trade-api/v2 prefix.
-            # Our client stores that prefix in base_url, so we must include it here.
-            base_path = (urlparse(self.base_url).path or "").rstrip("/")
-            signing_path = f"{base_path}{path}" if base_path else path
+            timestamp = str(time.time_ns() // 1_000_000)
+            signing_path = f"{self._base_path}{path}" if self._base_path else path
             msg_string = f"{timestamp}{method}{signing_path}"
             
-            if HAS_CRYPTO and self.api_secret:
-                # Load the private key from PEM
-                private_key = serialization.load_pem_private_key(
-                    self.api_secret.encode(),
-                    password=None,
-                    backend=default_backend()
-                )
+            if self._private_key is not None:
                 # Sign with RSA-PSS (Kalshi's required format)
-                signature_bytes = private_key.sign(
-                    msg_string.encode(),
-                    padding.PSS(
-                        mgf=padding.MGF1(hashes.SHA256()),
-                        salt_length=padding.PSS.MAX_LENGTH
-                    ),
-                    hashes.SHA256()
-                )
-                signature = base64.b64encode(signature_bytes).decode()
+                signature_bytes = self._private_key.sign(msg_string.encode(), *self._pss_args)
+                signature = _b64encode_str(signature_bytes)
             else:
                 # Fallback if cryptography not available
-                signature = base64.b64encode(
-                    hashlib.sha256(msg_string.encode()).digest()
-                ).decode()
+                signature = _b64encode_str(hashlib.sha256(msg_string.encode()).digest())
             
-            headers["KALSHI-ACCESS-KEY"] = self.api_key
-            headers["KALSHI-ACCESS-SIGNATURE"] = signature
-            headers["KALSHI-ACCESS-TIMESTAMP"] = timestamp
-        else:
-            # Token-based auth
-            if time.time() > self.token_expiry - 60:  # Refresh 1 min before expiry
-                self._login()
-            if self.token:
-                headers["Authorization"] = f"Bearer {self.token}"
+            return {
+                **self._BASE_HEADERS,
+                "KALSHI-ACCESS-KEY": self.api_key,
+                "KALSHI-ACCESS-SIGNATURE": signature,
+                "KALSHI-ACCESS-TIMESTAMP": timestamp,
+            }
         
-        return headers
+        # Token-based auth
+        if time.time() > self.token_expiry - 60:  # Refresh 1 min before expiry
+            self._login()
+        return self._token_headers.copy()
     
     def _login(self) -> None:
         """Login with email/password to get token."""
-        resp = requests.post(
+        resp = self._session.post(
             f"{self.base_url}/login",
             json={"email": self.email, "password": self.password},
             headers={"Content-Type": "application/json"},
@@ -217,6 +286,7 @@ class KalshiClient:
         resp.raise_for_status()
         data = resp.json()
         self.token = data["token"]
+        self._token_headers = {**self._BASE_HEADERS, "Authorization": f"Bearer {self.token}"}
         self.member_id = data["member_id"]
         # Tokens expire in 30 minutes
         self.token_expiry = time.time() + 1800
@@ -232,15 +302,20 @@ class KalshiClient:
         url = f"{self.base_url}{endpoint}"
         headers = self._get_headers(method, endpoint)
         
-        resp = requests.request(
+        # Serialize ourselves; headers already carry Content-Type: application/json
+        resp = self._session.request(
             method,
             url,
             headers=headers,
             params=params,
-            json=json_data,
+            data=_dumps(json_data) if json_data is not None else None,
         )
         resp.raise_for_status()
-        return resp.json()
+        return _loads(resp.content)
+    
+    def close(self) -> None:
+        """Release pooled HTTP connections."""
+        self._session.close()
     
     # -------------------------------------------------------------------------
     # Market Data (Public endpoints - no auth needed for basic data)
@@ -306,6 +381,19 @@ class KalshiClient:
         """
         return self._request("GET", f"/markets/{ticker}/orderbook", params={"depth": depth})
     
+    def _get_sports_events(self) -> List[Dict[str, Any]]:
+        """Open events whose title matches a sports keyword, cached for SPORTS_EVENTS_TTL."""
+        now = time.monotonic()
+        fetched_at, cached = self._sports_events
+        if cached and now - fetched_at < SPORTS_EVENTS_TTL:
+            return cached
+        events = self.get_events(status="open", limit=200)
+        # Check if event title contains sports keywords
+        sports_search = self._SPORTS_RE.search
+        sports_events = [event for event in events if sports_search(event.get("title", ""))]
+        self._sports_events = (now, sports_events)
+        return sports_events
+
     def get_sports_markets(self) -> List[KalshiMarket]:
         """
         Get all open sports-related markets.
@@ -316,16 +404,18 @@ class KalshiClient:
         - MLB World Series
         - Player props (points, touchdowns, etc.)
         """
-        # Try to find sports-related series
-        sports_keywords = ["NFL", "NBA", "MLB", "NHL", "SPORTS", "SUPER", "PLAYOFF"]
         all_markets = []
         
-        events = self.get_events(status="open", limit=200)
-        for event in events:
-            # Check if event title contains sports keywords
-            title = event.get("title", "").upper()
-            if any(kw in title for kw in sports_keywords):
-                event_markets = self.get_markets(event_ticker=event["event_ticker"])
+        sports_events = self._get_sports_events()
+        if not sports_events:
+            return all_markets
+        
+        # One request per event; fan out over the pooled session so latency is max(), not sum()
+        with ThreadPoolExecutor(max_workers=min(8, len(sports_events))) as pool:
+            per_event = pool.map(
+                lambda event: self.get_markets(event_ticker=event["event_ticker"]), sports_events
+            )
+            for event, event_markets in zip(sports_events, per_event):
                 for m in event_markets:
                     all_markets.append(
                         KalshiMarket(
@@ -418,6 +508,38 @@ class KalshiClient:
 # PolyPulse Integration Helper
 # -----------------------------------------------------------------------------
 
+def _team_matcher(pinnacle_odds: Dict[str, float]) -> Callable[[str], List[Tuple[str, float]]]:
+    """
+    Build a function mapping a lowercased market title to the (team, true_prob)
+    pairs whose names appear in it, in pinnacle_odds order.
+
+    With pyahocorasick installed each title is scanned once for all teams;
+    otherwise it falls back to one substring check per team.
+    """
+    teams = list(pinnacle_odds.items())
+    by_key: Dict[str, List[int]] = {}
+    for i, (team, _) in enumerate(teams):
+        by_key.setdefault(team.lower(), []).append(i)
+    always = by_key.pop("", [])  # an empty name is a substring of every title
+
+    if ahocorasick is None or not by_key:
+        lowered = [(team.lower(), team, prob) for team, prob in teams]
+        return lambda title: [(team, prob) for key, team, prob in lowered if key in title]
+
+    automaton = ahocorasick.Automaton()
+    for key, indices in by_key.items():
+        automaton.add_word(key, indices)
+    automaton.make_automaton()
+
+    def match(title: str) -> List[Tuple[str, float]]:
+        hits = set(always)
+        for _, indices in automaton.iter(title):
+            hits.update(indices)
+        return [teams[i] for i in sorted(hits)]
+
+    return match
+
+
 def find_arbitrage_opportunities(
     kalshi_client: KalshiClient,
     pinnacle_odds: Dict[str, float],  # {team_name: true_probability}
@@ -442,27 +564,25 @@ def find_arbitrage_opportunities(
     opportunities = []
     
     markets = kalshi_client.get_sports_markets()
+    match_teams = _team_matcher(pinnacle_odds)
     
     for market in markets:
         # Try to match market to Pinnacle odds
         # This is simplified - real matching would be more complex
-        market_title = market.title.lower()
-        
-        for team, true_prob in pinnacle_odds.items():
-            if team.lower() in market_title:
-                kalshi_price = market.yes_price / 100  # Convert cents to probability
-                edge = true_prob - kalshi_price
-                
-                if edge >= min_edge:
-                    opportunities.append({
-                        "ticker": market.ticker,
-                        "title": market.title,
-                        "team": team,
-                        "kalshi_price": kalshi_price,
-                        "true_prob": true_prob,
-                        "edge": edge,
-                        "volume": market.volume,
-                    })
+        for team, true_prob in match_teams(market.title.lower()):
+            kalshi_price = market.yes_price / 100  # Convert cents to probability
+            edge = true_prob - kalshi_price
+            
+            if edge >= min_edge:
+                opportunities.append({
+                    "ticker": market.ticker,
+                    "title": market.title,
+                    "team": team,
+                    "kalshi_price": kalshi_price,
+                    "true_prob": true_prob,
+                    "edge": edge,
+                    "volume": market.volume,
+                })
     
     return opportunities
 
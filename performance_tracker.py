@@ -2,46 +2,127 @@
 
 from __future__ import annotations
 
+import atexit
+import datetime as _dt
 import json
+import logging
+import queue
 import sqlite3
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Literal, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+
+try:
+    from orjson import dumps as _dumps, loads as _loads
+except ImportError:  # pragma: no cover - optional speedup
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
+
+logger = logging.getLogger("predictipulse.performance")
 
 Source = Literal["paper", "actual"]
 
+# Background writer: log_trade enqueues; the writer commits up to WRITE_BATCH_SIZE
+# rows per transaction, waiting at most WRITE_INTERVAL seconds to fill a batch.
+WRITE_QUEUE_SIZE = 10_000
+WRITE_BATCH_SIZE = 500
+WRITE_INTERVAL = 0.05
+
 
 class PerformanceTracker:
     """Lightweight SQLite-backed tracker for rolling performance."""
 
     def __init__(self, db_path: str = "performance.db") -> None:
         self.db_path = Path(db_path)
+        # Two long-lived connections shared by all threads: writes go through _conn
+        # under _lock, reads through _read_conn under _read_lock. With WAL the reader
+        # sees the last committed snapshot instead of waiting for a write to finish.
+        self._lock = threading.Lock()
+        self._conn = self._connect()
         self._ensure_schema()
+        self._read_lock = threading.Lock()
+        self._read_conn = self._connect()
+        # None is the writer's stop sentinel
+        self._queue: "queue.Queue[Optional[Tuple[Any, ...]]]" = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer = threading.Thread(target=self._writer_loop, name="perf-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def flush(self) -> None:
+        """Block until every queued trade has been committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Commit queued trades, stop the writer and close the connection."""
+        if not self._writer.is_alive():
+            return
+        self._queue.put(None)
+        self._writer.join()
+        with self._lock:
+            self._conn.close()
+        with self._read_lock:
+            self._read_conn.close()
+        atexit.unregister(self.close)
 
     # ------------------------------------------------------------------ #
     # Setup
     # ------------------------------------------------------------------ #
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
+        # Autocommit mode; writes open explicit transactions via _transaction()
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
         conn.row_factory = sqlite3.Row
+        # Per-connection tuning; WAL makes NORMAL sync safe (fsync only at checkpoints)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
         return conn
 
+    @contextmanager
+    def _reading(self) -> Iterator[sqlite3.Connection]:
+        with self._read_lock:
+            yield self._read_conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
     def _ensure_schema(self) -> None:
-        with self._connect() as conn:
-            conn.executescript(
+        with self._lock:
+            # Persistent on the database file: lets _read_conn read while _conn writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._migrate_trades_to_integers()
+            self._conn.executescript(
                 """
+                -- Integer storage: ms timestamps, cents, and edge in hundredths of a
+                -- percent. SQLite packs small ints into 1-6 bytes instead of 8 for REAL,
+                -- and sums stay exact. Reads convert back via _TRADE_COLUMNS.
                 CREATE TABLE IF NOT EXISTS trades (
                     id TEXT PRIMARY KEY,
                     source TEXT NOT NULL,
-                    ts REAL NOT NULL,
-                    pnl REAL NOT NULL,
-                    stake REAL NOT NULL,
-                    edge REAL DEFAULT 0,
+                    ts_ms INTEGER NOT NULL,
+                    pnl_cents INTEGER NOT NULL,
+                    stake_cents INTEGER NOT NULL,
+                    edge_bp INTEGER DEFAULT 0,
                     result TEXT,
                     matchup TEXT,
                     team TEXT
                 );
-                CREATE INDEX IF NOT EXISTS idx_trades_ts_source ON trades(ts, source);
+                -- Leading on source so "source=? AND ts_ms>=?" is a range seek; the trailing
+                -- columns let the rolling-metrics aggregates read only the index.
+                CREATE INDEX IF NOT EXISTS idx_trades_source_ts
+                    ON trades(source, ts_ms DESC, pnl_cents, stake_cents, edge_bp);
 
                 CREATE TABLE IF NOT EXISTS backtests (
                     id TEXT PRIMARY KEY,
@@ -55,62 +136,168 @@ class PerformanceTracker:
                 """
             )
 
+    def _migrate_trades_to_integers(self) -> None:
+        """Convert a trades table from the original REAL columns, if present."""
+        columns = {r["name"] for r in self._conn.execute("PRAGMA table_info(trades)")}
+        if "ts" not in columns:
+            return
+        self._conn.executescript(
+            """
+            BEGIN;
+            ALTER TABLE trades RENAME TO trades_real;
+            CREATE TABLE trades (
+                id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                ts_ms INTEGER NOT NULL,
+                pnl_cents INTEGER NOT NULL,
+                stake_cents INTEGER NOT NULL,
+                edge_bp INTEGER DEFAULT 0,
+                result TEXT,
+                matchup TEXT,
+                team TEXT
+            );
+            INSERT INTO trades
+                SELECT id, source,
+                       CAST(ROUND(ts * 1000) AS INTEGER),
+                       CAST(ROUND(pnl * 100) AS INTEGER),
+                       CAST(ROUND(stake * 100) AS INTEGER),
+                       CAST(ROUND(COALESCE(edge, 0) * 100) AS INTEGER),
+                       result, matchup, team
+                FROM trades_real;
+            DROP TABLE trades_real;
+            COMMIT;
+            """
+        )
+
     # ------------------------------------------------------------------ #
     # Trade logging
     # ------------------------------------------------------------------ #
+    _INSERT_TRADE = """
+        INSERT OR REPLACE INTO trades (
+            id, source, ts_ms, pnl_cents, stake_cents, edge_bp, result, matchup, team
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # Select list that converts stored integers back to the public float fields
+    _TRADE_COLUMNS = """
+        id, source, ts_ms / 1000.0 AS ts, pnl_cents / 100.0 AS pnl,
+        stake_cents / 100.0 AS stake, edge_bp / 100.0 AS edge, result, matchup, team
+    """
+
+    @staticmethod
+    def _trade_row(trade: Dict[str, Any], source: Source) -> Tuple[Any, ...]:
+        return (
+            str(trade["id"]),
+            source,
+            round(float(trade.get("timestamp") or time.time()) * 1000),
+            round(float(trade.get("pnl") or 0.0) * 100),
+            round(float(trade.get("stake") or 0.0) * 100),
+            round(float(trade.get("edge") or 0.0) * 100),
+            trade.get("result"),
+            trade.get("matchup"),
+            trade.get("team"),
+        )
+
     def log_trade(self, trade: Dict[str, Any], source: Source) -> None:
-        """Insert or update a trade record."""
+        """Queue a trade record for insert-or-update by the background writer."""
         if not trade.get("id"):
             return
-        with self._connect() as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO trades (
-                    id, source, ts, pnl, stake, edge, result, matchup, team
-                )
-                VALUES (:id, :source, :ts, :pnl, :stake, :edge, :result, :matchup, :team)
-                """,
-                {
-                    "id": str(trade["id"]),
-                    "source": source,
-                    "ts": float(trade.get("timestamp") or time.time()),
-                    "pnl": float(trade.get("pnl") or 0.0),
-                    "stake": float(trade.get("stake") or 0.0),
-                    "edge": float(trade.get("edge") or 0.0),
-                    "result": trade.get("result"),
-                    "matchup": trade.get("matchup"),
-                    "team": trade.get("team"),
-                },
-            )
+        row = self._trade_row(trade, source)
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            # Writer is behind; apply backpressure by writing inline rather than dropping
+            with self._transaction() as conn:
+                conn.execute(self._INSERT_TRADE, row)
+
+    def _writer_loop(self) -> None:
+        stopping = False
+        while not stopping:
+            row = self._queue.get()
+            rows = []
+            if row is None:
+                stopping = True
+            else:
+                rows.append(row)
+                deadline = time.monotonic() + WRITE_INTERVAL
+                while len(rows) < WRITE_BATCH_SIZE:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        row = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if row is None:
+                        stopping = True
+                        break
+                    rows.append(row)
+            try:
+                if rows:
+                    self._write_rows(rows)
+            finally:
+                # Always balance the gets, or flush()/close() would block forever
+                for _ in range(len(rows) + stopping):
+                    self._queue.task_done()
+
+    def _write_rows(self, rows: List[Tuple[Any, ...]]) -> None:
+        """Commit a batch; if it fails, retry row by row so one bad trade loses only itself."""
+        try:
+            with self._transaction() as conn:
+                conn.executemany(self._INSERT_TRADE, rows)
+            return
+        except Exception:
+            logger.exception("Failed to write %d trades as a batch; retrying individually", len(rows))
+        for row in rows:
+            try:
+                with self._transaction() as conn:
+                    conn.execute(self._INSERT_TRADE, row)
+            except Exception:
+                logger.exception("Failed to write trade row %r", row)
 
     def bulk_log(self, trades: Iterable[Dict[str, Any]], source: Source) -> None:
-        for trade in trades:
-            self.log_trade(trade, source)
+        """Insert or update many trades in a single transaction."""
+        rows = [self._trade_row(t, source) for t in trades if t.get("id")]
+        if not rows:
+            return
+        with self._transaction() as conn:
+            conn.executemany(self._INSERT_TRADE, rows)
 
     # ------------------------------------------------------------------ #
     # Metrics
     # ------------------------------------------------------------------ #
-    def _fetch_trades_since(self, days: int, source: Source) -> List[sqlite3.Row]:
-        cutoff = time.time() - days * 86400
-        with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT * FROM trades WHERE source=? AND ts>=? ORDER BY ts DESC",
-                (source, cutoff),
+    def get_rolling_metrics(self, days: int = 7, source: Source = "paper") -> Dict[str, Any]:
+        cutoff_ms = round((time.time() - days * 86400) * 1000)
+        # One index scan grouped by local day; window totals are then summed over
+        # at most ``days`` rows in Python
+        with self._reading() as conn:
+            daily_rows = conn.execute(
+                """
+                SELECT
+                    date(ts_ms / 1000, 'unixepoch', 'localtime') AS day,
+                    COUNT(*) AS trades,
+                    SUM(pnl_cents) / 100.0 AS pnl,
+                    SUM(CASE WHEN pnl_cents > 0 THEN 1 ELSE 0 END) AS wins,
+                    SUM(CASE WHEN pnl_cents < 0 THEN 1 ELSE 0 END) AS losses,
+                    SUM(stake_cents) AS stake_cents,
+                    SUM(edge_bp) AS edge_bp
+                FROM trades WHERE source=? AND ts_ms>=?
+                GROUP BY day
+                """,
+                (source, cutoff_ms),
             ).fetchall()
-        return rows
 
-    def get_rolling_metrics(self, days: int = 7, source: Source = "paper") -> Dict[str, Any]:
-        rows = self._fetch_trades_since(days, source)
-        pnl_total = sum(r["pnl"] for r in rows)
-        stakes = [r["stake"] for r in rows if r["stake"]]
-        trades = len(rows)
-        wins = len([r for r in rows if r["pnl"] > 0])
-        losses = len([r for r in rows if r["pnl"] < 0])
+        trades = sum(r["trades"] for r in daily_rows)
+        pnl_total = sum(r["pnl"] for r in daily_rows)
+        wins = sum(r["wins"] for r in daily_rows)
+        losses = sum(r["losses"] for r in daily_rows)
+        stake_sum = sum(r["stake_cents"] for r in daily_rows) / 100
         win_rate = (wins / trades * 100) if trades else 0.0
-        roi = (pnl_total / sum(stakes)) * 100 if stakes else 0.0
-        avg_edge = sum(r["edge"] for r in rows) / trades if trades else 0.0
+        roi = (pnl_total / stake_sum) * 100 if stake_sum else 0.0
+        avg_edge = sum(r["edge_bp"] for r in daily_rows) / 100 / trades if trades else 0.0
 
-        daily = self._daily_breakdown(rows, days)
+        daily = self._daily_breakdown(daily_rows, days)
 
         return {
             "trades": trades,
@@ -124,25 +311,27 @@ class PerformanceTracker:
         }
 
     def _daily_breakdown(self, rows: List[sqlite3.Row], days: int) -> List[Dict[str, Any]]:
+        """Lay per-day (day, pnl, trades) aggregates onto the last ``days`` local dates."""
+        # Step by calendar day ordinal: no localtime/strftime per day, and no skipped
+        # or repeated labels when a DST change makes a day 23 or 25 hours long
+        today = _dt.date.today().toordinal()
         buckets: Dict[str, Dict[str, Any]] = {}
-        now = time.time()
-        for i in range(days - 1, -1, -1):
-            day_start = now - i * 86400
-            key = time.strftime("%Y-%m-%d", time.localtime(day_start))
+        for ordinal in range(today - days + 1, today + 1):
+            key = _dt.date.fromordinal(ordinal).isoformat()
             buckets[key] = {"date": key, "pnl": 0.0, "trades": 0}
 
         for r in rows:
-            key = time.strftime("%Y-%m-%d", time.localtime(r["ts"]))
-            if key in buckets:
-                buckets[key]["pnl"] += r["pnl"]
-                buckets[key]["trades"] += 1
+            bucket = buckets.get(r["day"])
+            if bucket is not None:
+                bucket["pnl"] += r["pnl"]
+                bucket["trades"] += r["trades"]
 
         return list(buckets.values())
 
     def get_history(self, limit: int = 50, source: Source = "paper") -> List[Dict[str, Any]]:
-        with self._connect() as conn:
+        with self._reading() as conn:
             rows = conn.execute(
-                "SELECT * FROM trades WHERE source=? ORDER BY ts DESC LIMIT ?",
+                f"SELECT {self._TRADE_COLUMNS} FROM trades WHERE source=? ORDER BY ts_ms DESC LIMIT ?",
                 (source, limit),
             ).fetchall()
         return [dict(r) for r in rows]
@@ -158,7 +347,7 @@ class PerformanceTracker:
         end_date: str,
         summary: Dict[str, Any],
     ) -> None:
-        with self._connect() as conn:
+        with self._transaction() as conn:
             conn.execute(
                 """
                 INSERT OR REPLACE INTO backtests (
@@ -172,22 +361,36 @@ class PerformanceTracker:
                     ",".join(sports),
                     start_date,
                     end_date,
-                    json.dumps(summary),
+                    _dumps(summary).decode(),
                 ),
             )
 
     def list_backtests(self, limit: int = 20) -> List[Dict[str, Any]]:
-        with self._connect() as conn:
+        with self._reading() as conn:
             rows = conn.execute(
-                "SELECT * FROM backtests ORDER BY created_at DESC LIMIT ?",
+                """
+                SELECT id, created_at, sports, start_date, end_date, summary
+                FROM backtests ORDER BY created_at DESC LIMIT ?
+                """,
                 (limit,),
             ).fetchall()
-        results: List[Dict[str, Any]] = []
-        for r in rows:
-            payload = dict(r)
-            try:
-                payload["summary"] = json.loads(payload.get("summary") or "{}")
-            except json.JSONDecodeError:
-                payload["summary"] = {}
-            results.append(payload)
-        return results
+        return [
+            {
+                "id": r[0],
+                "created_at": r[1],
+                "sports": r[2],
+                "start_date": r[3],
+                "end_date": r[4],
+                "summary": self._load_summary(r[5]),
+            }
+            for r in rows
+        ]
+
+    @staticmethod
+    def _load_summary(raw: str) -> Dict[str, Any]:
+        if not raw:
+            return {}
+        try:
+            return _loads(raw)
+        except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError both subclass it
+            return {}
@@ -2,27 +2,207 @@
 
 from __future__ import annotations
 
+import atexit
 import csv
+import functools
+import itertools
 import json
 import logging
-import random
+import logging.handlers
+import queue
+import re
 import threading
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from pathlib import Path
-from queue import SimpleQueue, Empty
-from typing import Any, Dict, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from kalshi_adapter import KalshiClient
 from coinbase_adapter import CoinbaseClient
 from performance_tracker import PerformanceTracker
-from boltodds_adapter import BoltOddsClient, american_to_prob
+from boltodds_adapter import BoltOddsClient
 
 LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+_LEVELS = {"DEBUG": logging.DEBUG, "INFO": logging.INFO, "WARNING": logging.WARNING, "ERROR": logging.ERROR}
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves all formatting to the listener thread.
+
+    The stdlib prepare() runs ``msg % args`` in the emitting thread so records can
+    be pickled; ours never leave the process, so they are queued untouched.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Route root logging through a QueueHandler drained by a background listener.
+
+    Callers only enqueue records; the stderr write happens on the listener thread.
+    Like basicConfig this is a no-op if the root logger already has handlers, and it
+    is safe to call more than once.
+    """
+    global _log_listener
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    stream = logging.StreamHandler()
+    stream.setFormatter(logging.Formatter(LOG_FORMAT))
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    root.addHandler(_DeferredQueueHandler(records))
+    root.setLevel(level)
+    _log_listener = logging.handlers.QueueListener(records, stream, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
+class _JsonArg:
+    """Log argument rendered as JSON only when the record is formatted (``%s``)."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj)
+
+
+# Demo-mode matchups as (home, away)
+DEMO_TEAMS = (
+    ("Lakers", "Celtics"),
+    ("Warriors", "Suns"),
+    ("Knicks", "Heat"),
+    ("Eagles", "Cowboys"),
+    ("Chiefs", "Bills"),
+    ("Rangers", "Bruins"),
+)
+
+# Most recent trades kept in memory for the dashboard; older ones live in the tracker DB
+TRADE_HISTORY_CAPACITY = 10_000
+TRADE_RESULTS = ("PENDING", "WIN", "LOSS")
+_RESULT_CODES = {name: code for code, name in enumerate(TRADE_RESULTS)}
+
+# Kalshi account polling interval bounds (seconds); doubles while nothing changes
+KALSHI_REFRESH_MIN = 2.0
+KALSHI_REFRESH_MAX = 60.0
+
+# Items held per dashboard stream; the oldest are dropped if no one is consuming
+STREAM_BUFFER_SIZE = 1024
+LOG_BUFFER_SIZE = 4096
+
 
+def _kelly_and_stake(
+    true_prob: float,
+    market_prob: float,
+    bankroll: float,
+    kelly_multiplier: float,
+    max_dollar: float,
+    max_pct: float,
+) -> Tuple[float, float]:
+    """Return (edge in percent, Kelly stake capped by max_dollar and max_pct of bankroll)."""
+    odds = 1.0 / market_prob - 1.0
+    kelly_fraction = max(0.0, (true_prob * odds - (1.0 - true_prob)) / odds)
+    stake = min(bankroll * kelly_fraction * kelly_multiplier, max_dollar, bankroll * max_pct / 100.0)
+    return (true_prob - market_prob) * 100.0, max(0.0, stake)
 
-@dataclass
+
+BASE_DIR = Path(__file__).parent
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_MATCHUP_SEP = re.compile(r"\s+(?:vs\.?|v\.?|@|at)\s+", re.IGNORECASE)
+# Kalshi's category is the event category ("Sports"); the league is encoded in the
+# series prefix of the ticker, e.g. KXNBAGAME-25OCT21HOUOKC-OKC
+_TICKER_LEAGUE = re.compile(r"^(?:KX)?(WNBA|NBA|NFL|NHL|MLB|MLS|NCAAF|NCAAMB|NCAAB)")
+_LEAGUE_ALIASES = {"NCAAMB": "NCAAB"}
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_team(name: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace; names repeat every scan."""
+    return " ".join(_NON_ALNUM.sub(" ", name.lower()).split())
+
+
+def _market_sport(market: Dict[str, Any]) -> str:
+    """League of a prediction market: from its ticker's series prefix, else its category."""
+    m = _TICKER_LEAGUE.match(market.get("ticker") or "")
+    if m:
+        return _LEAGUE_ALIASES.get(m.group(1), m.group(1))
+    return market.get("category") or ""
+
+
+def _team_key(sport: str, name: str) -> Optional[Tuple[str, str]]:
+    """
+    Index key for a team: (sport, full normalized name), or None for a blank name.
+
+    Scoped by sport and never reduced to a nickname, since names like "Giants" or
+    "Cardinals" are shared across leagues.
+    """
+    full = _normalize_team(name)
+    return (_normalize_team(sport), full) if full else None
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def _first_key_row(key_path: Path) -> Optional[Dict[str, str]]:
+    """First row of the credentials csv that carries an api_key."""
+    with key_path.open() as fh:
+        for row in csv.DictReader(fh):
+            if row.get("api_key") or row.get("key"):
+                return row
+    return None
+
+
+@functools.lru_cache(maxsize=4)
+def _read_kalshi_keys(
+    key_path: Path, key_mtime_ns: int, pem_path: Path, pem_mtime_ns: int
+) -> Optional[MappingProxyType]:
+    """
+    Parse the first credential row of ``key_path``; reconnects reuse the result.
+
+    Only non-secret fields are memoized: the api_key and where the private key lives.
+    The PEM (or an inline csv api_secret) is read when the client is built, so no
+    secret is kept alive by this cache. The mtimes are part of the cache key only, so
+    editing either file (or creating it, mtime 0 -> real) is picked up without a restart.
+    """
+    if not key_mtime_ns:
+        return None
+    row = _first_key_row(key_path)
+    if row is None:
+        return None
+    api_key = row.get("api_key") or row.get("key")
+    inline_secret = bool((row.get("api_secret") or "").strip())
+    # Prefer the PEM file, then csv api_secret, then the csv's private_key_file reference
+    if pem_mtime_ns:
+        private_key_file = str(pem_path)
+    elif inline_secret:
+        private_key_file = None
+    else:
+        private_key_file = (row.get("private_key_file") or "").strip() or None
+    return MappingProxyType({
+        "api_key": api_key.strip(),
+        "inline_secret": inline_secret and not pem_mtime_ns,
+        "private_key_file": private_key_file,
+    })
+
+
+@dataclass(slots=True)
 class Trade:
     id: str
     matchup: str
@@ -35,6 +215,171 @@ class Trade:
     pnl: float
     timestamp: float
 
+    def to_dict(self) -> Dict[str, Any]:
+        # Flat fields only, so skip asdict()'s recursive deep copy
+        return {
+            "id": self.id,
+            "matchup": self.matchup,
+            "team": self.team,
+            "stake": self.stake,
+            "entry_price": self.entry_price,
+            "true_prob": self.true_prob,
+            "edge": self.edge,
+            "result": self.result,
+            "pnl": self.pnl,
+            "timestamp": self.timestamp,
+        }
+
+
+class _StreamBuffer:
+    """
+    Bounded FIFO feeding the SSE streams, with the put/get/get_nowait surface of a queue.
+
+    deque append/popleft are atomic under the GIL, so producers never take a lock;
+    an Event only wakes readers blocked on an empty buffer. Raises queue.Empty on timeout.
+    """
+
+    def __init__(self, maxlen: int = STREAM_BUFFER_SIZE):
+        self._items: deque = deque(maxlen=maxlen)
+        self._ready = threading.Event()
+        self.dropped = 0  # items evicted unread because the buffer was full
+
+    def put(self, item: Any) -> None:
+        if len(self._items) == self._items.maxlen:
+            self.dropped += 1
+        self._items.append(item)
+        self._ready.set()
+
+    def put_many(self, items: List[Any]) -> None:
+        """Append a batch with a single reader wakeup."""
+        if not items:
+            return
+        overflow = len(self._items) + len(items) - self._items.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self._items.extend(items)
+        self._ready.set()
+
+    def get_nowait(self) -> Any:
+        try:
+            return self._items.popleft()
+        except IndexError:
+            raise Empty from None
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                pass
+            self._ready.clear()
+            if self._items:  # a put landed between popleft and clear
+                continue
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise Empty
+            self._ready.wait(remaining)
+
+
+class _TradeHistory:
+    """
+    Fixed-capacity ring buffer of trades stored column-wise.
+
+    Numeric fields are parallel float64 arrays and the result is an int8 code, so
+    aggregate stats are vectorized; Trade dicts are rebuilt only for the rows asked for.
+    Only the demo loop appends in place (readers may see a trade appear one call late);
+    a Kalshi sync builds a new buffer with from_trades and the engine swaps it in with
+    one attribute store, so readers never see a half-written sync.
+    """
+
+    _FLOAT_FIELDS = ("stake", "entry_price", "true_prob", "edge", "pnl", "timestamp")
+
+    def __init__(self, capacity: int = TRADE_HISTORY_CAPACITY):
+        if capacity < 1:
+            raise ValueError(f"trade history capacity must be >= 1, got {capacity}")
+        self.capacity = capacity
+        self._floats = {name: np.zeros(capacity, dtype=np.float64) for name in self._FLOAT_FIELDS}
+        self._pnl = self._floats["pnl"]
+        self._result = np.zeros(capacity, dtype=np.int8)
+        self._ids = np.empty(capacity, dtype=object)
+        self._matchups = np.empty(capacity, dtype=object)
+        self._teams = np.empty(capacity, dtype=object)
+        self._head = 0  # next slot to write
+        self._count = 0
+        # Running win/loss sums over the buffered trades so avg_rr is O(1)
+        self._win_pnl_sum = 0.0
+        self._win_pnl_n = 0
+        self._loss_pnl_sum = 0.0
+        self._loss_pnl_n = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _account(self, pnl: float, sign: int) -> None:
+        if pnl > 0:
+            self._win_pnl_sum += sign * pnl
+            self._win_pnl_n += sign
+        elif pnl < 0:
+            self._loss_pnl_sum -= sign * pnl
+            self._loss_pnl_n += sign
+
+    def append(self, trade: Trade) -> None:
+        i = self._head
+        if self._count == self.capacity:
+            self._account(float(self._pnl[i]), -1)  # evicting the oldest trade
+        self._account(trade.pnl, 1)
+        for name, column in self._floats.items():
+            column[i] = getattr(trade, name)
+        self._result[i] = _RESULT_CODES.get(trade.result, 0)
+        self._ids[i] = trade.id
+        self._matchups[i] = trade.matchup
+        self._teams[i] = trade.team
+        self._head = (i + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    @classmethod
+    def from_trades(cls, trades: List[Trade], capacity: int = TRADE_HISTORY_CAPACITY) -> "_TradeHistory":
+        """A new buffer holding ``trades`` (keeping the newest ``capacity`` of them)."""
+        history = cls(capacity)
+        for trade in trades[-capacity:]:
+            history.append(trade)
+        return history
+
+    def recent(self, limit: int) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` trades as dicts, newest first."""
+        n = min(max(limit, 0), self._count)
+        if not n:
+            return []
+        idx = (self._head - 1 - np.arange(n)) % self.capacity
+        columns = {name: column[idx].tolist() for name, column in self._floats.items()}
+        results = self._result[idx].tolist()
+        ids = self._ids[idx].tolist()
+        matchups = self._matchups[idx].tolist()
+        teams = self._teams[idx].tolist()
+        return [
+            {
+                "id": ids[k],
+                "matchup": matchups[k],
+                "team": teams[k],
+                "stake": columns["stake"][k],
+                "entry_price": columns["entry_price"][k],
+                "true_prob": columns["true_prob"][k],
+                "edge": columns["edge"][k],
+                "result": TRADE_RESULTS[results[k]],
+                "pnl": columns["pnl"][k],
+                "timestamp": columns["timestamp"][k],
+            }
+            for k in range(n)
+        ]
+
+    def avg_rr(self) -> float:
+        """Average win divided by average loss over the buffered trades."""
+        if not self._win_pnl_n or not self._loss_pnl_n or self._loss_pnl_sum <= 0:
+            return 0.0
+        return (self._win_pnl_sum / self._win_pnl_n) / (self._loss_pnl_sum / self._loss_pnl_n)
+
 
 class PredictipulseEngine:
     def __init__(
@@ -44,20 +389,34 @@ class PredictipulseEngine:
         performance_tracker: Optional[PerformanceTracker] = None,
     ):
         self.config = dict(config)
+        self._sizing = self._sizing_from(self.config)
         self.demo_mode = demo_mode
         self._running = False
         self._thread: Optional[threading.Thread] = None
-        self._log_queue: SimpleQueue[str] = SimpleQueue()
-        self._opp_queue: SimpleQueue[Dict[str, Any]] = SimpleQueue()
-        self._trade_queue: SimpleQueue[Dict[str, Any]] = SimpleQueue()
+        self._kalshi_thread: Optional[threading.Thread] = None
+        self._stop_evt = threading.Event()
+        # Overlaps independent HTTP calls (account sync, per-scan fetches); threads start lazily
+        self._http_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="predictipulse-http")
+        self._log_queue = _StreamBuffer(LOG_BUFFER_SIZE)
+        self._opp_queue = _StreamBuffer()
+        self._trade_queue = _StreamBuffer()
         self._lock = threading.Lock()
+        configure_logging()
         self.logger = logging.getLogger("predictipulse_engine")
         self.performance_tracker = performance_tracker
+        self._rng = np.random.default_rng()
+        self._ts_cache: Tuple[int, str] = (0, "")
 
         # Stats tracking - default to 0 until we get real data from Kalshi
         self._bankroll = 0.0
         self._initial_bankroll = 0.0
-        self._trades: List[Trade] = []
+        # Sized once here: changing trade_history_cap via update_config takes effect on restart
+        self._trades = _TradeHistory(int(self.config.get("trade_history_cap", TRADE_HISTORY_CAPACITY)))
+        self._positions_sig: Tuple[Any, ...] = ()
+        # Per-session prefix (wall-clock ms, hex) keeps ids unique across restarts in the
+        # tracker DB however fast a session issued them
+        self._trade_id_prefix = f"trade-{time.time_ns() // 1_000_000:x}-"
+        self._trade_seq = itertools.count(1)
         self._win_count = 0
         self._loss_count = 0
         self._total_pnl = 0.0
@@ -84,33 +443,55 @@ class PredictipulseEngine:
             if self._running:
                 return
             self._running = True
+            self._stop_evt.clear()
             self._thread = threading.Thread(target=self._run_loop, daemon=True)
             self._thread.start()
+            if self._live_mode and self.kalshi_client:
+                self._kalshi_thread = threading.Thread(target=self._kalshi_poll_loop, daemon=True)
+                self._kalshi_thread.start()
         self._emit_log("INFO", "PolyPulse engine started.")
 
     def stop(self) -> None:
         with self._lock:
             self._running = False
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=2)
+            self._stop_evt.set()
+        for thread in (self._thread, self._kalshi_thread):
+            if thread and thread.is_alive():
+                thread.join(timeout=2)
         self._emit_log("INFO", "PolyPulse engine stopped.")
 
     def is_running(self) -> bool:
+        # Plain attribute read; _running is only written under _lock by start/stop
         return self._running
 
     # ------------------------------------------------------------------
     # Config
     # ------------------------------------------------------------------
+    # Single writer, many readers: update_config builds a new dict under _lock and
+    # swaps it in with one attribute store, so readers (the engine thread, get_config)
+    # always see a complete config without taking the lock. Never mutate self.config
+    # in place.
     def update_config(self, new_config: Dict[str, Any]) -> None:
         with self._lock:
             # Don't allow bankroll to be set via config - it comes from Kalshi
             new_config.pop("bankroll", None)
-            self.config.update(new_config)
-        self._emit_log("INFO", f"Configuration updated: {json.dumps(new_config)}")
+            config = dict(self.config)
+            config.update(new_config)
+            self.config = config
+            self._sizing = self._sizing_from(config)
+        self._emit_log_lazy("INFO", "Configuration updated: %s", _JsonArg(dict(new_config)))
 
     def get_config(self) -> Dict[str, Any]:
-        with self._lock:
-            return dict(self.config)
+        return dict(self.config)
+
+    @staticmethod
+    def _sizing_from(config: Dict[str, Any]) -> Tuple[float, float, float]:
+        """(kelly_multiplier, max_dollar_bet, max_percentage_bet) as floats, read once per config."""
+        return (
+            float(config.get("kelly_multiplier", 0.5)),
+            float(config.get("max_dollar_bet", 50)),
+            float(config.get("max_percentage_bet", 10)),
+        )
 
     # ------------------------------------------------------------------
     # Stats
@@ -135,57 +516,64 @@ class PredictipulseEngine:
             "losses": self._loss_count,
             "win_rate": round(win_rate, 1),
             "avg_rr": round(avg_rr, 2),
+            "stream_dropped": (
+                self._log_queue.dropped + self._opp_queue.dropped + self._trade_queue.dropped
+            ),
         }
     
     def _calculate_avg_rr(self) -> float:
         """Calculate average risk to reward ratio from trades."""
-        if not self._trades:
-            return 0.0
-        
-        wins = []
-        losses = []
-        for trade in self._trades:
-            pnl = getattr(trade, 'pnl', 0) or 0
-            if pnl > 0:
-                wins.append(pnl)
-            elif pnl < 0:
-                losses.append(abs(pnl))
-        
-        if not wins or not losses:
-            return 0.0
-        
-        avg_win = sum(wins) / len(wins)
-        avg_loss = sum(losses) / len(losses)
-        
-        if avg_loss == 0:
-            return 0.0
-        
-        return avg_win / avg_loss
+        return self._trades.avg_rr()
 
     def get_recent_trades(self, limit: int = 20) -> List[Dict[str, Any]]:
-        return [asdict(t) for t in self._trades[-limit:]][::-1]
+        return self._trades.recent(limit)
 
     # ------------------------------------------------------------------
     # Streaming helpers
     # ------------------------------------------------------------------
-    def next_log(self, timeout: float = 1.0) -> Optional[str]:
+    # By default these block until an item arrives, so SSE consumers wake only
+    # when there is something to send. A timeout returns None when it expires.
+    def next_log(self, timeout: Optional[float] = None) -> Optional[str]:
         try:
-            return self._log_queue.get(timeout=timeout)
+            return self._render_log(self._log_queue.get(timeout=timeout))
         except Empty:
             return None
 
-    def next_opportunity(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+    def next_opportunity(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
         try:
             return self._opp_queue.get(timeout=timeout)
         except Empty:
             return None
 
-    def next_trade(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+    def next_trade(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
         try:
             return self._trade_queue.get(timeout=timeout)
         except Empty:
             return None
 
+    # Batched variants: block for the first item, then drain whatever else is
+    # already queued (up to max_items) so bursts go out as a single SSE event.
+    def next_logs(self, timeout: Optional[float] = None, max_items: int = 32) -> List[str]:
+        return [self._render_log(item) for item in self._drain(self._log_queue, timeout, max_items)]
+
+    def next_opportunities(
+        self, timeout: Optional[float] = None, max_items: int = 32
+    ) -> List[Dict[str, Any]]:
+        return self._drain(self._opp_queue, timeout, max_items)
+
+    @staticmethod
+    def _drain(queue: _StreamBuffer, timeout: Optional[float], max_items: int) -> List[Any]:
+        try:
+            batch = [queue.get(timeout=timeout)]
+        except Empty:
+            return []
+        while len(batch) < max_items:
+            try:
+                batch.append(queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
     # ------------------------------------------------------------------
     # Internal simulation loop (demo mode)
     # ------------------------------------------------------------------
@@ -196,16 +584,19 @@ class PredictipulseEngine:
             
             while self._running:
                 try:
-                    # Refresh account balance
-                    self._refresh_kalshi_account()
-                    
+                    # Account balance/positions are refreshed by _kalshi_poll_loop
                     # Fetch data from both sources
                     self._emit_log("INFO", "Scanning for opportunities...")
                     
-                    boltodds_games = self._fetch_boltodds_games()
-                    boltodds_markets = self._fetch_boltodds_markets()
+                    # The four sources are independent; overlap their round-trips
+                    pool = self._http_pool
+                    games_future = pool.submit(self._fetch_boltodds_games)
+                    markets_future = pool.submit(self._fetch_boltodds_markets)
+                    coinbase_future = pool.submit(self._fetch_coinbase_markets)
                     kalshi_markets = self._fetch_kalshi_sports_markets()
-                    coinbase_markets = self._fetch_coinbase_markets()
+                    boltodds_games = games_future.result()
+                    boltodds_markets = markets_future.result()
+                    coinbase_markets = coinbase_future.result()
                     
                     games_count = len(boltodds_games) if isinstance(boltodds_games, dict) else 0
                     self._emit_log(
@@ -221,13 +612,13 @@ class PredictipulseEngine:
                     opportunities = self._find_opportunities(sharp_games, kalshi_markets, coinbase_markets)
                     
                     # Emit opportunities to the dashboard
+                    self._opp_queue.put_many(opportunities)
                     for opp in opportunities:
-                        self._opp_queue.put(opp)
                         if opp.get("edge", 0) > 0:
-                            self._emit_log(
+                            self._emit_log_lazy(
                                 "INFO",
-                                f"Opportunity: {opp['matchup']} | Edge: {opp['edge']:.2f}% | "
-                                f"Stake: ${opp.get('kelly_stake', 0):.2f}"
+                                "Opportunity: %s | Edge: %.2f%% | Stake: $%.2f",
+                                opp["matchup"], opp["edge"], opp.get("kelly_stake", 0),
                             )
                     
                     if not opportunities:
@@ -236,71 +627,57 @@ class PredictipulseEngine:
                 except Exception as exc:
                     self._emit_log("WARNING", f"Scan cycle error: {exc}")
                 
-                # Wait before next scan
-                for _ in range(scan_interval):
-                    if not self._running:
-                        break
-                    time.sleep(1)
+                # Wait before next scan; stop() wakes this immediately
+                if self._stop_evt.wait(scan_interval):
+                    break
             return
 
-        teams = [
-            ("Lakers", "Celtics"),
-            ("Warriors", "Suns"),
-            ("Knicks", "Heat"),
-            ("Eagles", "Cowboys"),
-            ("Chiefs", "Bills"),
-            ("Rangers", "Bruins"),
-        ]
-
         while self._running:
-            time.sleep(2)
-
-            home, away = random.choice(teams)
-            true_prob = round(random.uniform(0.35, 0.65), 3)
-            market_prob = max(0.05, min(0.95, true_prob - random.uniform(0.02, 0.08)))
-            edge = (true_prob - market_prob) * 100
-            kelly_multiplier = float(self.config.get("kelly_multiplier", 0.5))
-            kelly_fraction = max(
-                0.0,
-                ((true_prob * (1 / market_prob - 1)) - (1 - true_prob))
-                / (1 / market_prob - 1),
-            )
-            stake = self._bankroll * kelly_fraction * kelly_multiplier
-            stake = min(stake, float(self.config.get("max_dollar_bet", 50)))
-            stake = min(stake, self._bankroll * float(self.config.get("max_percentage_bet", 10)) / 100)
-
-            team = home if random.random() > 0.5 else away
-
-            opp = {
-                "matchup": f"{home} vs {away}",
-                "team": team,
-                "sport": "sim",
-                "true_prob": true_prob,
-                "market_prob": market_prob,
-                "edge": edge,
-                "kelly_stake": max(0.0, stake),
-                "timestamp": time.time(),
-            }
+            if self._stop_evt.wait(2):
+                break
+
+            # One opportunity per tick, so scalar draws beat NumPy array setup
+            opp, take = self._demo_opportunity()
             self._opp_queue.put(opp)
-            self._emit_log(
+            self._emit_log_lazy(
                 "INFO",
-                f"Opportunity: {opp['matchup']} edge={opp['edge']:.2f}% stake=${opp['kelly_stake']:.2f}",
+                "Opportunity: %s edge=%.2f%% stake=$%.2f",
+                opp["matchup"], opp["edge"], opp["kelly_stake"],
             )
-
-            # Simulate taking trades on ~40% of opportunities
-            if random.random() < 0.4 and stake > 1:
+            if take:
                 self._simulate_trade(opp)
 
+    def _demo_opportunity(self) -> Tuple[Dict[str, Any], bool]:
+        """Draw one simulated opportunity as (opp, take_trade) from the engine's generator."""
+        rand = self._rng.random  # scalar draws; uniform(a, b) as a + rand() * (b - a)
+        home, away = DEMO_TEAMS[int(rand() * len(DEMO_TEAMS))]
+        true_prob = round(0.35 + rand() * 0.30, 3)
+        market_prob = max(0.05, min(0.95, true_prob - (0.02 + rand() * 0.06)))
+        kelly_multiplier, max_dollar, max_pct = self._sizing
+        edge, stake = _kelly_and_stake(
+            true_prob, market_prob, self._bankroll, kelly_multiplier, max_dollar, max_pct
+        )
+        opp = {
+            "matchup": f"{home} vs {away}",
+            "team": home if rand() > 0.5 else away,
+            "sport": "sim",
+            "true_prob": true_prob,
+            "market_prob": market_prob,
+            "edge": edge,
+            "kelly_stake": stake,
+            "timestamp": time.time(),
+        }
+        # Simulate taking trades on ~40% of opportunities
+        return opp, rand() < 0.4 and stake > 1
+
     def _simulate_trade(self, opp: Dict[str, Any]) -> None:
         """Simulate a trade with realistic outcome based on true probability."""
         stake = opp["kelly_stake"]
-        true_prob = opp["true_prob"]
         market_prob = opp["market_prob"]
 
         # Simulate outcome - win probability is the true probability
         # (in real trading, you'd wait for game result)
-        win = random.random() < true_prob
-
+        win = self._rng.random() < opp["true_prob"]
         if win:
             # Payout is 1/market_prob - 1 (e.g., if market_prob=0.5, payout is 1:1)
             pnl = stake * (1 / market_prob - 1)
@@ -315,11 +692,11 @@ class PredictipulseEngine:
         self._total_pnl += pnl
 
         trade = Trade(
-            id=f"trade-{int(time.time() * 1000)}",
+            id=f"{self._trade_id_prefix}{next(self._trade_seq)}",
             matchup=opp["matchup"],
             team=opp["team"],
             stake=round(stake, 2),
-            entry_price=opp["market_prob"],
+            entry_price=market_prob,
             true_prob=opp["true_prob"],
             edge=opp["edge"],
             result=result,
@@ -328,54 +705,28 @@ class PredictipulseEngine:
         )
 
         self._trades.append(trade)
-        self._trade_queue.put(asdict(trade))
+        trade_dict = trade.to_dict()
+        self._trade_queue.put(trade_dict)
         if self.performance_tracker:
-            self.performance_tracker.log_trade(asdict(trade), source="paper")
+            self.performance_tracker.log_trade(trade_dict, source="paper")
 
-        self._emit_log(
+        self._emit_log_lazy(
             "INFO" if win else "WARNING",
-            f"TRADE {result}: {trade.matchup} ({trade.team}) "
-            f"stake=${trade.stake:.2f} → P&L=${trade.pnl:+.2f} "
-            f"| Bankroll: ${self._bankroll:.2f}",
+            "TRADE %s: %s (%s) stake=$%.2f → P&L=$%+.2f | Bankroll: $%.2f",
+            result, trade.matchup, trade.team, trade.stake, trade.pnl, self._bankroll,
         )
 
     # ------------------------------------------------------------------
     # Kalshi account helpers
     # ------------------------------------------------------------------
-    def _load_kalshi_keys(self) -> Optional[Dict[str, str]]:
+    def _load_kalshi_keys(self) -> Optional[MappingProxyType]:
         """Load Kalshi credentials from kalshi_keys.csv and kalshi_private.pem."""
-        base_dir = Path(__file__).parent
-        key_path = base_dir / "kalshi_keys.csv"
         # Support both .pem and .txt extensions for the private key
-        pem_path = base_dir / "kalshi_private.pem"
+        pem_path = BASE_DIR / "kalshi_private.pem"
         if not pem_path.exists():
-            pem_path = base_dir / "kalshi_private_key.txt"
-        
-        if not key_path.exists():
-            return None
-        
-        # Try to load inline secret from PEM file if it exists
-        pem_secret = None
-        if pem_path.exists():
-            try:
-                pem_secret = pem_path.read_text().strip()
-            except Exception:
-                pass
-        
-        with key_path.open() as fh:
-            reader = csv.DictReader(fh)
-            for row in reader:
-                api_key = row.get("api_key") or row.get("key")
-                api_secret = row.get("api_secret")
-                private_key_file = row.get("private_key_file")
-                if api_key:
-                    # Prefer PEM file content, then csv api_secret, then private_key_file reference
-                    return {
-                        "api_key": api_key.strip(),
-                        "api_secret": pem_secret or (api_secret or "").strip() or None,
-                        "private_key_file": (private_key_file or "").strip() or None if not pem_secret else None,
-                    }
-        return None
+            pem_path = BASE_DIR / "kalshi_private_key.txt"
+        key_path = BASE_DIR / "kalshi_keys.csv"
+        return _read_kalshi_keys(key_path, _mtime_ns(key_path), pem_path, _mtime_ns(pem_path))
 
     def _init_kalshi_client(self) -> None:
         keys = self._load_kalshi_keys()
@@ -388,15 +739,20 @@ class PredictipulseEngine:
             # Resolve private key path relative to project directory
             private_key_path = None
             if keys.get("private_key_file"):
-                pem_path = Path(__file__).parent / keys["private_key_file"]
+                pem_path = BASE_DIR / keys["private_key_file"]
                 if pem_path.exists():
                     private_key_path = str(pem_path)
                 else:
                     self._emit_log("WARNING", f"Private key file not found: {pem_path}")
+            # Inline secrets are read here rather than cached with the other key fields
+            api_secret = None
+            if keys.get("inline_secret"):
+                row = _first_key_row(BASE_DIR / "kalshi_keys.csv")
+                api_secret = (row.get("api_secret") or "").strip() or None if row else None
             
             self.kalshi_client = KalshiClient(
                 api_key=keys.get("api_key"),
-                api_secret=keys.get("api_secret"),
+                api_secret=api_secret,
                 api_secret_path=private_key_path,
                 demo=False,
             )
@@ -408,50 +764,97 @@ class PredictipulseEngine:
             self._live_mode = False
 
     def _convert_positions_to_trades(self, positions: List[Dict[str, Any]]) -> List[Trade]:
-        trades: List[Trade] = []
+        n = len(positions)
+        if not n:
+            return []
         now = time.time()
-        for pos in positions:
-            ticker = pos.get("ticker") or pos.get("market_ticker") or "unknown"
-            pnl_cents = pos.get("pnl", 0)
-            position_size = pos.get("position", pos.get("yes_position", 0))
-            avg_price = pos.get("avg_price", pos.get("avg_entry_price", 0))
-            pnl = round(pnl_cents / 100, 2) if isinstance(pnl_cents, (int, float)) else 0.0
-            entry_price = float(avg_price) / 100 if avg_price else 0.0
-            trades.append(
-                Trade(
-                    id=f"kalshi-{ticker}",
-                    matchup=ticker,
-                    team=str(pos.get("side", "yes")).upper(),
-                    stake=float(position_size or 0),
-                    entry_price=entry_price,
-                    true_prob=entry_price,
-                    edge=0.0,
-                    result="PENDING",
-                    pnl=pnl,
-                    timestamp=now,
-                )
+        # Pull the numeric columns out in one pass each and do the unit math as arrays
+        pnl = np.fromiter(
+            (p if isinstance(p := pos.get("pnl", 0), (int, float)) else 0 for pos in positions),
+            dtype=np.float64,
+            count=n,
+        )
+        pnl = (pnl / 100).round(2)
+        size = np.fromiter(
+            (pos.get("position", pos.get("yes_position", 0)) or 0 for pos in positions),
+            dtype=np.float64,
+            count=n,
+        )
+        entry = np.fromiter(
+            (pos.get("avg_price", pos.get("avg_entry_price", 0)) or 0 for pos in positions),
+            dtype=np.float64,
+            count=n,
+        ) / 100
+        tickers = [pos.get("ticker") or pos.get("market_ticker") or "unknown" for pos in positions]
+        ids = []
+        seen: Dict[str, int] = {}
+        for ticker in tickers:
+            # Repeat tickers (e.g. both sides held) get -2, -3... so tracker rows don't overwrite
+            n_seen = seen[ticker] = seen.get(ticker, 0) + 1
+            ids.append(f"kalshi-{ticker}" if n_seen == 1 else f"kalshi-{ticker}-{n_seen}")
+        return [
+            Trade(
+                id=trade_id,
+                matchup=ticker,
+                team=str(pos.get("side", "yes")).upper(),
+                stake=stake,
+                entry_price=entry_price,
+                true_prob=entry_price,
+                edge=0.0,
+                result="PENDING",
+                pnl=trade_pnl,
+                timestamp=now,
             )
-        return trades
+            for pos, trade_id, ticker, stake, entry_price, trade_pnl in zip(
+                positions,
+                ids,
+                tickers,
+                size.tolist(),
+                entry.tolist(),
+                pnl.tolist(),
+            )
+        ]
 
-    def _refresh_kalshi_account(self) -> None:
+    def _refresh_kalshi_account(self) -> bool:
+        """Sync balance and positions from Kalshi; return True if either changed."""
         if not self.kalshi_client:
-            return
+            return False
         try:
+            positions_future = self._http_pool.submit(self.kalshi_client.get_positions)
             balance = self.kalshi_client.get_balance()
+            positions = positions_future.result()
             balance_cents = balance.get("balance") or balance.get("available") or 0
-            self._bankroll = round(float(balance_cents) / 100, 2)
+            bankroll = round(float(balance_cents) / 100, 2)
+            changed = bankroll != self._bankroll
+            self._bankroll = bankroll
             if not self._initial_bankroll:
                 self._initial_bankroll = self._bankroll
             self._total_pnl = round(self._bankroll - self._initial_bankroll, 2)
-            positions = self.kalshi_client.get_positions()
-            self._trades = self._convert_positions_to_trades(positions)
+            trades = self._convert_positions_to_trades(positions)
+            sig = tuple((t.id, t.stake, t.entry_price, t.pnl) for t in trades)
+            if sig == self._positions_sig:
+                return changed
+            self._positions_sig = sig
+            # Built off to the side and published with one store; see _TradeHistory
+            self._trades = _TradeHistory.from_trades(trades, self._trades.capacity)
             if self.performance_tracker:
                 self.performance_tracker.bulk_log(
-                    [asdict(t) for t in self._trades],
+                    [t.to_dict() for t in trades],
                     source="actual",
                 )
+            return True
         except Exception as exc:  # pragma: no cover - network errors
             self._emit_log("WARNING", f"Kalshi sync failed: {exc}")
+            return False
+
+    def _kalshi_poll_loop(self) -> None:
+        """Refresh the Kalshi account on its own thread, backing off while it is idle."""
+        backoff = KALSHI_REFRESH_MIN
+        while self._running:
+            changed = self._refresh_kalshi_account()
+            backoff = KALSHI_REFRESH_MIN if changed else min(KALSHI_REFRESH_MAX, backoff * 2)
+            if self._stop_evt.wait(backoff):
+                break
 
     def check_kalshi_connection(self) -> Dict[str, Any]:
         """Check if Kalshi API connection is working."""
@@ -517,6 +920,8 @@ class PredictipulseEngine:
         - sharp_odds: American odds from sharp book
         """
         opportunities = []
+        # Filter by configured sports; read once per scan (config is swapped, not mutated)
+        configured_sports = frozenset(self.config.get("sports", ()))
         
         # BoltOdds returns games as dict with game_id -> game_info
         for game_key, game_info in games.items():
@@ -527,8 +932,6 @@ class PredictipulseEngine:
             matchup = game_info.get("game", game_key)
             universal_id = game_info.get("universal_id", "")
             
-            # Filter by configured sports
-            configured_sports = self.config.get("sports", [])
             if sport not in configured_sports:
                 continue
             
@@ -542,7 +945,7 @@ class PredictipulseEngine:
         return opportunities
 
     def _fetch_kalshi_sports_markets(self) -> List[Dict[str, Any]]:
-        """Fetch sports markets from Kalshi."""
+        """Fetch sports markets from Kalshi; prices are refetched on every scan."""
         if not self.kalshi_client:
             return []
         try:
@@ -580,67 +983,80 @@ class PredictipulseEngine:
         Checks both Kalshi and Coinbase markets.
         """
         opportunities = []
-        target_ev = float(self.config.get("target_buy_ev", 0.05))
-        min_prob = float(self.config.get("min_true_prob", 0.15))
-        max_prob = float(self.config.get("max_true_prob", 0.85))
+        cfg = self.config  # one snapshot for the whole scan
+        target_ev = float(cfg.get("target_buy_ev", 0.05))
+        min_prob = float(cfg.get("min_true_prob", 0.15))
+        max_prob = float(cfg.get("max_true_prob", 0.85))
+        kelly_multiplier, max_dollar, max_pct = self._sizing
         
         # Combine all prediction markets
         all_markets = list(kalshi_markets)
         if coinbase_markets:
             all_markets.extend(coinbase_markets)
         
+        n = len(all_markets)
+        if not n:
+            return opportunities
+
+        # Filter and price every market as arrays; only survivors become dicts
+        yes_prices = np.fromiter((m.get("yes_price", 0) for m in all_markets), dtype=np.float64, count=n)
+        # Kalshi prices are in cents (0-100)
+        market_prob = yes_prices / 100.0
+        keep = np.flatnonzero((yes_prices > 0) & (market_prob >= min_prob) & (market_prob <= max_prob))
+        if not keep.size:
+            return opportunities
+        market_prob = market_prob[keep]
+
         # For now, emit available markets as potential opportunities
-        # Real matching would require team name normalization between platforms
-        for market in all_markets:
-            yes_price = market.get("yes_price", 0)
-            if yes_price <= 0:
-                continue
-            
-            # Kalshi prices are in cents (0-100)
-            market_prob = yes_price / 100.0
-            
-            # Skip if outside probability bounds
-            if market_prob < min_prob or market_prob > max_prob:
-                continue
-            
-            # For demo purposes, estimate a "sharp" probability with small edge
-            # In production, this would come from matching BoltOdds games
-            estimated_sharp_prob = market_prob  # Placeholder - no edge yet
-            
-            # Determine source (kalshi or coinbase)
-            source = market.get("source", "kalshi")
-            
-            opp = {
+        # Real matching would require team name normalization between platforms.
+        # For demo purposes, estimate a "sharp" probability; in production this
+        # would come from matching BoltOdds games
+        sharp_prob = market_prob.copy()  # Placeholder - no edge yet
+        edge = (sharp_prob - market_prob) * 100
+        stake = np.zeros(keep.size)
+        # Kelly stake only where there is positive edge (none until matching lands)
+        for i in np.flatnonzero(sharp_prob > market_prob).tolist():
+            _, stake[i] = _kelly_and_stake(
+                sharp_prob[i], market_prob[i], self._bankroll, kelly_multiplier, max_dollar, max_pct
+            )
+
+        # Index surviving markets by team once per scan so game matching is O(games + markets)
+        by_team: Dict[Tuple[str, str], List[int]] = {}
+        for idx in keep.tolist():
+            market = all_markets[idx]
+            key = _team_key(_market_sport(market), market.get("subtitle") or "")
+            if key is not None:
+                by_team.setdefault(key, []).append(idx)
+        game_for_market: Dict[int, Dict[str, Any]] = {}
+        for game in boltodds_games:
+            sport = game.get("sport") or ""
+            for team in _MATCHUP_SEP.split(game.get("matchup", "")):
+                for idx in by_team.get(_team_key(sport, team), ()):
+                    game_for_market.setdefault(idx, game)
+
+        now = time.time()
+        for idx, tp, mp, e, st in zip(
+            keep.tolist(), sharp_prob.tolist(), market_prob.tolist(), edge.tolist(), stake.tolist()
+        ):
+            market = all_markets[idx]
+            game = game_for_market.get(idx)
+            opportunities.append({
                 "matchup": market.get("title", market.get("ticker", "")),
                 "team": market.get("subtitle", "YES"),
                 "sport": market.get("category", "SPORTS"),
-                "true_prob": estimated_sharp_prob,
-                "market_prob": market_prob,
-                "edge": (estimated_sharp_prob - market_prob) * 100,
+                "true_prob": tp,
+                "market_prob": mp,
+                "edge": e,
                 "ticker": market.get("ticker"),
-                "yes_price": yes_price,
+                "yes_price": market.get("yes_price", 0),
                 "volume": market.get("volume", 0),
-                "source": source,
-                "timestamp": time.time(),
-            }
-            
-            # Calculate Kelly stake
-            kelly_multiplier = float(self.config.get("kelly_multiplier", 0.5))
-            if market_prob > 0 and estimated_sharp_prob > market_prob:
-                kelly_fraction = max(
-                    0.0,
-                    ((estimated_sharp_prob * (1 / market_prob - 1)) - (1 - estimated_sharp_prob))
-                    / (1 / market_prob - 1),
-                )
-                stake = self._bankroll * kelly_fraction * kelly_multiplier
-                stake = min(stake, float(self.config.get("max_dollar_bet", 50)))
-                stake = min(stake, self._bankroll * float(self.config.get("max_percentage_bet", 10)) / 100)
-                opp["kelly_stake"] = max(0.0, stake)
-            else:
-                opp["kelly_stake"] = 0.0
-            
-            opportunities.append(opp)
-        
+                # Determine source (kalshi or coinbase)
+                "source": market.get("source", "kalshi"),
+                "timestamp": now,
+                "kelly_stake": st,
+                "universal_id": game.get("universal_id") if game else None,
+            })
+
         return opportunities
 
     # ------------------------------------------------------------------
@@ -733,8 +1149,37 @@ class PredictipulseEngine:
     # ------------------------------------------------------------------
     # Logging
     # ------------------------------------------------------------------
+    def _log_ts(self) -> str:
+        sec = int(time.time())
+        cached_sec, ts = self._ts_cache
+        if sec != cached_sec:
+            # Format at most once per wall-clock second
+            ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+            self._ts_cache = (sec, ts)
+        return ts
+
     def _emit_log(self, level: str, message: str) -> None:
-        ts = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-        log_line = f"[{ts}] {level} - {message}"
-        self._log_queue.put(log_line)
-        getattr(self.logger, level.lower(), self.logger.info)(message)
+        self._log_queue.put(f"[{self._log_ts()}] {level} - {message}")
+        lvl = _LEVELS.get(level, logging.INFO)
+        if self.logger.isEnabledFor(lvl):
+            self.logger.log(lvl, message)
+
+    def _emit_log_lazy(self, level: str, fmt: str, *args: Any) -> None:
+        """
+        Like _emit_log, but never formats on the caller's thread.
+
+        The dashboard always gets a (ts, level, fmt, args) record, rendered by next_log(s)
+        when read. The logger record is formatted by the handlers; with configure_logging's
+        _DeferredQueueHandler that happens on the listener thread.
+        """
+        self._log_queue.put((self._log_ts(), level, fmt, args))
+        lvl = _LEVELS.get(level, logging.INFO)
+        if self.logger.isEnabledFor(lvl):
+            self.logger.log(lvl, fmt, *args)
+
+    @staticmethod
+    def _render_log(item: Any) -> str:
+        if isinstance(item, str):
+            return item
+        ts, level, fmt, args = item
+        return f"[{ts}] {level} - {fmt % args}"